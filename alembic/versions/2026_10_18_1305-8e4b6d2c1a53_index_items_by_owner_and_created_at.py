@@ -0,0 +1,40 @@
+"""Index items by owner and created_at
+
+Serves owner-scoped listings in created_at order (keyset on created_at, id)
+and replaces the single-column owner_id index, which is its prefix.
+
+Revision ID: 8e4b6d2c1a53
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-18 13:05:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e4b6d2c1a53"
+down_revision: str | None = "3f1c2a9d7b10"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY on Postgres, so writes to items are not blocked while it builds
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_items_owner_id_created_at_id",
+            "items",
+            ["owner_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_items_owner_id", table_name="items", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index("ix_items_owner_id", "items", ["owner_id"], postgresql_concurrently=True)
+        op.drop_index(
+            "ix_items_owner_id_created_at_id", table_name="items", postgresql_concurrently=True
+        )
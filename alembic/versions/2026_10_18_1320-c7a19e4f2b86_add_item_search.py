@@ -0,0 +1,88 @@
+"""Add full-text search over items
+
+Postgres: a generated search_vector (name weighted above description) with a
+GIN index, and a pg_trgm GIN index on name for prefix and fuzzy matches.
+Adding the stored column rewrites items under an exclusive lock; the indexes
+are then built CONCURRENTLY. SQLite: an FTS5 table over items kept in sync by
+triggers.
+
+Revision ID: c7a19e4f2b86
+Revises: 8e4b6d2c1a53
+Create Date: 2026-10-18 13:20:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7a19e4f2b86"
+down_revision: str | None = "8e4b6d2c1a53"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            """
+            ALTER TABLE items ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+            ) STORED
+            """
+        )
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY ix_items_search_vector ON items USING gin (search_vector)"
+            )
+            op.execute(
+                "CREATE INDEX CONCURRENTLY ix_items_name_trgm ON items USING gin (name gin_trgm_ops)"
+            )
+    elif op.get_bind().dialect.name == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE items_fts USING fts5("
+            "name, description, content='items', content_rowid='id')"
+        )
+        op.execute(
+            """
+            CREATE TRIGGER items_fts_insert AFTER INSERT ON items BEGIN
+                INSERT INTO items_fts (rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER items_fts_delete AFTER DELETE ON items BEGIN
+                INSERT INTO items_fts (items_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER items_fts_update AFTER UPDATE ON items BEGIN
+                INSERT INTO items_fts (items_fts, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+                INSERT INTO items_fts (rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+            """
+        )
+        # Index the rows that already exist
+        op.execute("INSERT INTO items_fts (items_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_items_name_trgm")
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_items_search_vector")
+        op.execute("ALTER TABLE items DROP COLUMN search_vector")
+    elif op.get_bind().dialect.name == "sqlite":
+        for trigger in ("items_fts_update", "items_fts_delete", "items_fts_insert"):
+            op.execute(f"DROP TRIGGER {trigger}")
+        op.execute("DROP TABLE items_fts")
@@ -0,0 +1,32 @@
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from app.schemas.batch import BatchError
+
+# Rows per multi-row INSERT ... RETURNING statement
+BATCH_CHUNK_SIZE = 1000
+
+
+def validate_rows[T: BaseModel](
+    rows: Sequence[dict[str, Any]],
+    schema: type[T],
+) -> tuple[list[tuple[int, T]], list[BatchError]]:
+    """Validate each row independently, returning valid rows with their index and errors."""
+    valid: list[tuple[int, T]] = []
+    errors: list[BatchError] = []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, schema.model_validate(row)))
+        except ValidationError as e:
+            errors.append(
+                BatchError(index=index, errors=e.errors(include_url=False, include_context=False))
+            )
+    return valid, errors
+
+
+def chunked[T](rows: Sequence[T], size: int = BATCH_CHUNK_SIZE) -> Iterator[Sequence[T]]:
+    """Split rows into consecutive chunks of at most ``size``."""
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
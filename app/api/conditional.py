@@ -0,0 +1,62 @@
+import hashlib
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+
+def _stamp(value: datetime | str) -> str:
+    """Canonical form of a timestamp, whether from a row or a cached JSON payload."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def make_etag(versions: Iterable[tuple[int, datetime | str]]) -> str:
+    """Weak ETag over ``(id, updated_at)`` pairs."""
+    digest = hashlib.blake2b(digest_size=16)
+    for id_, updated_at in versions:
+        digest.update(f"{id_}:{_stamp(updated_at)};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def resource_etag(resource: dict[str, Any]) -> str:
+    """ETag for one serialized resource."""
+    return make_etag([(resource["id"], resource["updated_at"])])
+
+
+def page_etag(rows: Iterable[Any]) -> str:
+    """ETag for a page of rows: changes when any row changes or the id set does."""
+    return make_etag((row.id, row.updated_at) for row in rows)
+
+
+def _opaque(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Whether ``If-None-Match`` already names ``etag`` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(",")}
+
+
+def set_validators(response: Response, etag: str) -> None:
+    """Attach ``ETag`` and ``Cache-Control`` to a full response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = settings.HTTP_CACHE_CONTROL
+
+
+def not_modified(etag: str, headers: dict[str, str] | None = None) -> Response:
+    """Bodyless 304 carrying the validators the 200 would have had."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    set_validators(response, etag)
+    return response
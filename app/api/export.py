@@ -0,0 +1,28 @@
+from collections.abc import AsyncIterator
+from typing import Any
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.serialization import RowSerializer
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Rows fetched per server-side cursor round trip and written per chunk
+EXPORT_BATCH_SIZE = 1000
+
+
+async def stream_ndjson(
+    db: AsyncSession,
+    stmt: Select[*tuple[Any, ...]],
+    serializer: RowSerializer[Any],
+) -> AsyncIterator[bytes]:
+    """Stream rows of ``serializer.select()`` as NDJSON using a server-side cursor.
+
+    Rows are fetched ``EXPORT_BATCH_SIZE`` at a time and each batch is sent as
+    one chunk; the next batch is only fetched once the client has accepted the
+    previous one, so memory stays constant regardless of table size.
+    """
+    result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    async for partition in result.partitions():
+        yield b"".join(serializer.to_json(row) + b"\n" for row in partition)
@@ -0,0 +1,116 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import ColumnElement, func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.db.keyset import KEYSET_COLUMNS, SortKey
+from app.db.search import SearchMode
+from app.services.cache import get_or_compute
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Planner statistics; -1 until the table has been vacuumed or analyzed
+ROW_ESTIMATE_SQL = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"
+)
+
+
+def encode_cursor(order_by: SortKey | SearchMode, values: Sequence[Any]) -> str:
+    """Encode the keyset of the last row into an opaque cursor."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps({"o": order_by, "v": payload}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _load_cursor(cursor: str) -> dict[str, Any]:
+    data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    if not isinstance(data, dict):
+        raise ValueError("malformed cursor")
+    return data
+
+
+def cursor_ordering(cursor: str) -> str | None:
+    """Ordering a cursor was encoded for, or None if it is malformed."""
+    try:
+        ordering = _load_cursor(cursor).get("o")
+    except (binascii.Error, ValueError):
+        return None
+    return ordering if isinstance(ordering, str) else None
+
+
+def decode_cursor(cursor: str, order_by: SortKey | SearchMode) -> list[Any]:
+    """Decode a cursor produced by ``encode_cursor`` for the same ordering."""
+    try:
+        data = _load_cursor(cursor)
+        values = list(data["v"])
+        if data["o"] != order_by or len(values) != len(KEYSET_COLUMNS[order_by]):
+            raise ValueError("cursor does not match ordering")
+        if not isinstance(values[-1], int):
+            raise ValueError("malformed cursor")
+        if order_by == "created_at":
+            values[0] = datetime.fromisoformat(values[0])
+        elif order_by in ("fts", "trigram") and (
+            isinstance(values[0], bool) or not isinstance(values[0], int | float)
+        ):
+            raise ValueError("malformed cursor")
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        ) from e
+    return values
+
+
+def page_params(
+    *, order_by: SortKey, limit: int, skip: int = 0, cursor: str | None = None
+) -> dict[str, Any]:
+    """Parameters of a ``page_statement`` with ``keyset=cursor is not None, offset=bool(skip)``."""
+    if cursor is None:
+        return {"limit": limit, "offset": skip} if skip else {"limit": limit}
+    values = decode_cursor(cursor, order_by)
+    names = KEYSET_COLUMNS[order_by]
+    return {"limit": limit} | {
+        f"after_{name}": value for name, value in zip(names, values, strict=True)
+    }
+
+
+def next_cursor(rows: Sequence[Any], *, order_by: SortKey | SearchMode, limit: int) -> str | None:
+    """Cursor for the page after ``rows``, or None when this was the last page."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(order_by, [getattr(last, name) for name in KEYSET_COLUMNS[order_by]])
+
+
+async def cached_total(
+    db: AsyncSession, model: Any, *criteria: ColumnElement[bool], key: str
+) -> int:
+    """Approximate row count for a listing, without a COUNT(*) per request.
+
+    Unfiltered Postgres tables report the planner's row estimate. Filtered
+    counts run once per ``CACHE_TOTAL_TTL_SECONDS`` across all workers and
+    should be backed by an index on the filter columns.
+    """
+    engine = db.bind
+    if not isinstance(engine, AsyncEngine):
+        raise RuntimeError("cached_total needs a session bound to an AsyncEngine")
+
+    async def count() -> int:
+        # Own session: a cached total may be refreshed after the request ends
+        async with AsyncSession(engine) as session:
+            if not criteria and engine.dialect.name == "postgresql":
+                estimate = await session.scalar(ROW_ESTIMATE_SQL, {"table": model.__tablename__})
+                if estimate is not None and estimate >= 0:
+                    return estimate
+            stmt = select(func.count()).select_from(model).where(*criteria)
+            return await session.scalar(stmt) or 0
+
+    return await get_or_compute(key, count, ttl=settings.CACHE_TOTAL_TTL_SECONDS)
@@ -0,0 +1,54 @@
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+from sqlalchemy import Select, select
+from starlette.responses import Response
+
+from app.core.json import dumps
+from app.db.columns import schema_columns
+from app.models.item import Item
+from app.models.user import User
+from app.schemas.item import ItemResponse
+from app.schemas.user import UserResponse
+
+
+class JSONBytesResponse(Response):
+    """``application/json`` response whose body is already encoded."""
+
+    media_type = "application/json"
+
+
+class RowSerializer[T: BaseModel]:
+    """Encode column rows as a response schema without building models.
+
+    Selects exactly the schema's fields, in schema order, and turns each row
+    into a dict keyed by field name. No validation runs: the values come from
+    our own columns, whose types already match the schema. Only plain field
+    schemas (no aliases or custom serializers) are supported.
+    """
+
+    def __init__(self, model: type[Any], schema: type[T]) -> None:
+        self.schema = schema
+        self.fields = tuple(schema.model_fields)
+        self.columns = schema_columns(model, schema)
+
+    def select(self) -> Select[*tuple[Any, ...]]:
+        """``SELECT`` of exactly the columns the schema needs."""
+        return select(*self.columns)
+
+    def to_dict(self, row: Sequence[Any]) -> dict[str, Any]:
+        """JSON-compatible dict, e.g. for caching."""
+        return to_jsonable_python(dict(zip(self.fields, row, strict=True)))
+
+    def to_json(self, row: Sequence[Any]) -> bytes:
+        return dumps(dict(zip(self.fields, row, strict=True)))
+
+    def to_json_list(self, rows: Iterable[Sequence[Any]]) -> bytes:
+        fields = self.fields
+        return dumps([dict(zip(fields, row, strict=True)) for row in rows])
+
+
+ITEM_ROWS = RowSerializer(Item, ItemResponse)
+USER_ROWS = RowSerializer(User, UserResponse)
@@ -1,25 +1,159 @@
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.api.batch import chunked, validate_rows
+from app.api.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified,
+    page_etag,
+    resource_etag,
+    set_validators,
+)
+from app.api.export import NDJSON_MEDIA_TYPE, stream_ndjson
+from app.api.pagination import (
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_HEADER,
+    cached_total,
+    cursor_ordering,
+    decode_cursor,
+    next_cursor,
+    page_params,
+)
+from app.api.serialization import ITEM_ROWS, JSONBytesResponse
+from app.core.config import settings
+from app.core.json import dumps
+from app.db import queries
+from app.db.keyset import SortKey
+from app.db.loader import BatchLoader, rows_by_id
+from app.db.search import SearchMode, search_query, search_terms
+from app.db.session import get_db, get_read_db
 from app.models.item import Item
-from app.schemas.item import ItemCreate, ItemResponse
+from app.schemas.item import ItemBatchResponse, ItemCreate, ItemResponse
+from app.services.cache import (
+    get_many,
+    get_or_load,
+    item_cache_key,
+    set_cache,
+    set_many,
+)
 
 router = APIRouter()
 
+# Most ids accepted by one GET /items?ids=... request
+MAX_IDS = 100
+
+# Concurrent GET /items/{id} requests share one query
+item_loader: BatchLoader[int, dict[str, Any]] = BatchLoader(
+    rows_by_id(queries.items_by_id, Item.id, ITEM_ROWS.to_dict)
+)
+
+
+def item_page_query(
+    *,
+    order_by: SortKey,
+    limit: int,
+    skip: int = 0,
+    cursor: str | None = None,
+    owner_id: int | None = None,
+) -> tuple[Select[*tuple[Any, ...]], dict[str, Any]]:
+    """Statement and parameters for one page of items.
+
+    Owner pages are served by ix_items_owner_id_created_at_id.
+    """
+    stmt = queries.item_page(
+        order_by, owner=owner_id is not None, keyset=cursor is not None, offset=bool(skip)
+    )
+    params = page_params(order_by=order_by, limit=limit, skip=skip, cursor=cursor)
+    if owner_id is not None:
+        params["owner_id"] = owner_id
+    return stmt, params
+
 
 @router.get("/items", response_model=list[ItemResponse])
 async def list_items(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-) -> list[Item]:
-    """List all items with pagination."""
-    result = await db.execute(select(Item).offset(skip).limit(limit))
-    return list(result.scalars().all())
+    cursor: str | None = None,
+    order_by: SortKey = "id",
+    owner_id: int | None = None,
+    include_total: bool = False,
+    ids: Annotated[str | None, Query(pattern=r"^\d+(,\d+)*$")] = None,
+) -> Response:
+    """List items, optionally of one owner, with offset or keyset (``cursor``) pagination.
+
+    ``include_total`` adds an approximate ``X-Total-Count``; ``ids`` fetches
+    specific items instead.
+    """
+    if ids is not None:
+        return await get_items_by_id(db, request, [int(id_) for id_ in ids.split(",")])
+
+    stmt, params = item_page_query(
+        order_by=order_by, limit=limit, skip=skip, cursor=cursor, owner_id=owner_id
+    )
+    result = await db.execute(stmt, params)
+    items = result.all()
+
+    token = next_cursor(items, order_by=order_by, limit=limit)
+    headers = {NEXT_CURSOR_HEADER: token} if token is not None else {}
+    if include_total:
+        if owner_id is None:
+            total = await cached_total(db, Item, key="total:items")
+        else:
+            total = await cached_total(
+                db, Item, Item.owner_id == owner_id, key=f"total:items:owner:{owner_id}"
+            )
+        headers[TOTAL_COUNT_HEADER] = str(total)
+
+    etag = page_etag(items)
+    if is_not_modified(request, etag):
+        return not_modified(etag, headers)
+
+    response = JSONBytesResponse(ITEM_ROWS.to_json_list(items), headers=headers)
+    set_validators(response, etag)
+    return response
+
+
+async def get_items_by_id(db: AsyncSession, request: Request, ids: list[int]) -> Response:
+    """Items for ``ids`` in request order, skipping unknown ids.
+
+    Cached items come from one Redis round trip; the rest share one batched
+    query with concurrent single-item lookups.
+    """
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_IDS} ids per request",
+        )
+
+    items = await get_many(item_cache_key(id_) for id_ in ids)
+    missing = [id_ for id_, item in zip(ids, items, strict=True) if item is None]
+    if missing:
+        loaded = dict(zip(missing, await item_loader.load_many(db, missing), strict=True))
+        items = [
+            item if item is not None else loaded[id_] for id_, item in zip(ids, items, strict=True)
+        ]
+        await set_many(
+            {item_cache_key(id_): item for id_, item in loaded.items() if item is not None},
+            ttl=settings.CACHE_TTL_SECONDS,
+        )
+
+    found = [item for item in items if item is not None]
+    etag = make_etag((item["id"], item["updated_at"]) for item in found)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    response = JSONBytesResponse(dumps(found))
+    set_validators(response, etag)
+    return response
 
 
 @router.post("/items", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
@@ -31,23 +165,140 @@ async def create_item(
     item = Item(**item_in.model_dump(), owner_id=1)  # TODO: Get from auth
     db.add(item)
     await db.commit()
-    await db.refresh(item)
+
+    # Write-through so a stale entry for a reused id never outlives the insert
+    await set_cache(
+        item_cache_key(item.id), ItemResponse.model_validate(item).model_dump(mode="json")
+    )
     return item
 
 
+@router.post("/items:batch", response_model=ItemBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_items_batch(
+    rows: Annotated[list[dict[str, Any]], Body(max_length=settings.BATCH_MAX_ROWS)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict[str, Any]:
+    """Create many items in one transaction, reporting rows that fail validation."""
+    valid, errors = validate_rows(rows, ItemCreate)
+
+    created: list[Item] = []
+    for chunk in chunked(valid):
+        result = await db.scalars(
+            insert(Item).returning(Item, sort_by_parameter_order=True),
+            [{**item_in.model_dump(), "owner_id": 1} for _, item_in in chunk],
+        )
+        created.extend(result.all())
+    await db.commit()
+
+    # Write-through, as for single creates
+    await set_many(
+        {
+            item_cache_key(item.id): ItemResponse.model_validate(item).model_dump(mode="json")
+            for item in created
+        },
+        ttl=settings.CACHE_TTL_SECONDS,
+    )
+    return {"created": created, "errors": errors}
+
+
+@router.get("/items/export", response_class=StreamingResponse)
+async def export_items(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    owner_id: int | None = None,
+    updated_since: datetime | None = None,
+    updated_before: datetime | None = None,
+) -> StreamingResponse:
+    """Stream items as NDJSON, optionally filtered for incremental sync."""
+    stmt = ITEM_ROWS.select().order_by(Item.id)
+    if owner_id is not None:
+        stmt = stmt.where(Item.owner_id == owner_id)
+    if updated_since is not None:
+        stmt = stmt.where(Item.updated_at >= updated_since)
+    if updated_before is not None:
+        stmt = stmt.where(Item.updated_at < updated_before)
+
+    return StreamingResponse(
+        stream_ndjson(db, stmt, ITEM_ROWS),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
+@router.get("/items/search", response_model=list[ItemResponse])
+async def search_items(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    request: Request,
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: str | None = None,
+) -> Response:
+    """Items whose name or description contains every word of ``q``, best first.
+
+    Words match as prefixes. When nothing matches, items with names similar
+    to ``q`` (misspellings, partial words) are returned instead; the cursor
+    records which of the two result sets it pages through.
+    """
+    if not search_terms(q):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query contains no words",
+        )
+    dialect = db.get_bind().dialect.name
+
+    mode: SearchMode = "fts"
+    after = None
+    if cursor is not None:
+        mode = "trigram" if cursor_ordering(cursor) == "trigram" else "fts"
+        after_rank, after_id = decode_cursor(cursor, mode)
+        after = (after_rank, after_id)
+
+    stmt = ITEM_ROWS.select()
+    result = await db.execute(
+        search_query(stmt, q, mode=mode, dialect=dialect, limit=limit, after=after)
+    )
+    rows = result.all()
+    if not rows and cursor is None:
+        mode = "trigram"
+        result = await db.execute(search_query(stmt, q, mode=mode, dialect=dialect, limit=limit))
+        rows = result.all()
+
+    token = next_cursor(rows, order_by=mode, limit=limit)
+    headers = {NEXT_CURSOR_HEADER: token} if token is not None else {}
+
+    etag = page_etag(rows)
+    if is_not_modified(request, etag):
+        return not_modified(etag, headers)
+
+    # Rows end with the rank, which is not part of the response
+    response = JSONBytesResponse(ITEM_ROWS.to_json_list(row[:-1] for row in rows), headers=headers)
+    set_validators(response, etag)
+    return response
+
+
 @router.get("/items/{item_id}", response_model=ItemResponse)
 async def get_item(
     item_id: int,
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> Item:
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    request: Request,
+) -> Response:
     """Get item by ID."""
-    result = await db.execute(select(Item).where(Item.id == item_id))
-    item = result.scalar_one_or_none()
 
-    if not item:
+    async def load() -> dict[str, Any] | None:
+        return await item_loader.load(db, item_id)
+
+    item = await get_or_load(item_cache_key(item_id), load)
+
+    if item is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Item not found",
         )
 
-    return item
+    # Validated against the cached payload, so an unchanged item costs no DB query
+    etag = resource_etag(item)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    # The cached payload was produced by ItemResponse, so it is encoded as is
+    response = JSONBytesResponse(dumps(item))
+    set_validators(response, etag)
+    return response
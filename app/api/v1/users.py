@@ -1,25 +1,67 @@
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.api.batch import chunked, validate_rows
+from app.api.conditional import (
+    is_not_modified,
+    not_modified,
+    page_etag,
+    resource_etag,
+    set_validators,
+)
+from app.api.export import NDJSON_MEDIA_TYPE, stream_ndjson
+from app.api.pagination import NEXT_CURSOR_HEADER, next_cursor, page_params
+from app.api.serialization import USER_ROWS, JSONBytesResponse
+from app.core.config import settings
+from app.core.json import dumps
+from app.db import queries
+from app.db.dml import insert_ignoring_conflicts
+from app.db.keyset import SortKey
+from app.db.loader import BatchLoader, rows_by_id
+from app.db.session import get_db, get_read_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserResponse
+from app.schemas.batch import BatchError
+from app.schemas.user import UserBatchResponse, UserCreate, UserResponse
+from app.services.cache import get_or_load, set_cache, set_many, user_cache_key
 
 router = APIRouter()
 
+# Concurrent GET /users/{id} requests share one query
+user_loader: BatchLoader[int, dict[str, Any]] = BatchLoader(
+    rows_by_id(queries.users_by_id, User.id, USER_ROWS.to_dict)
+)
+
+DUPLICATE_USER_DETAIL = "User with this email or username already exists"
+
 
 @router.get("/users", response_model=list[UserResponse])
 async def list_users(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-) -> list[User]:
-    """List all users with pagination."""
-    result = await db.execute(select(User).offset(skip).limit(limit))
-    return list(result.scalars().all())
+    cursor: str | None = None,
+    order_by: SortKey = "id",
+) -> Response:
+    """List all users with offset or keyset (``cursor``) pagination."""
+    stmt = queries.user_page(order_by, keyset=cursor is not None, offset=bool(skip))
+    params = page_params(order_by=order_by, limit=limit, skip=skip, cursor=cursor)
+    result = await db.execute(stmt, params)
+    users = result.all()
+
+    token = next_cursor(users, order_by=order_by, limit=limit)
+    headers = {NEXT_CURSOR_HEADER: token} if token is not None else {}
+    etag = page_etag(users)
+    if is_not_modified(request, etag):
+        return not_modified(etag, headers)
+
+    response = JSONBytesResponse(USER_ROWS.to_json_list(users), headers=headers)
+    set_validators(response, etag)
+    return response
 
 
 @router.post("/users", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -28,36 +70,109 @@ async def create_user(
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> User:
     """Create a new user."""
-    # Check if user exists
-    result = await db.execute(
-        select(User).where((User.email == user_in.email) | (User.username == user_in.username))
-    )
-    if result.scalar_one_or_none():
+    # Uniqueness is enforced by the insert itself: a conflicting row returns nothing
+    inserted = await insert_ignoring_conflicts(db, User, [user_in.model_dump()])
+    if not inserted:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User with this email or username already exists",
+            detail=DUPLICATE_USER_DETAIL,
         )
-
-    user = User(**user_in.model_dump())
-    db.add(user)
+    user = inserted[0]
     await db.commit()
-    await db.refresh(user)
+
+    # Write-through so a stale entry for a reused id never outlives the insert
+    await set_cache(
+        user_cache_key(user.id), UserResponse.model_validate(user).model_dump(mode="json")
+    )
     return user
 
 
+@router.post("/users:batch", response_model=UserBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_users_batch(
+    rows: Annotated[list[dict[str, Any]], Body(max_length=settings.BATCH_MAX_ROWS)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict[str, Any]:
+    """Create many users in one transaction, reporting invalid or duplicate rows."""
+    valid, errors = validate_rows(rows, UserCreate)
+
+    created: list[User] = []
+    for chunk in chunked(valid):
+        result = await insert_ignoring_conflicts(
+            db, User, [user_in.model_dump() for _, user_in in chunk]
+        )
+        inserted = {user.email: user for user in result}
+        for index, user_in in chunk:
+            user = inserted.pop(user_in.email, None)
+            if user is None:
+                errors.append(_duplicate_error(index))
+            else:
+                created.append(user)
+    await db.commit()
+
+    # Write-through, as for single creates
+    await set_many(
+        {
+            user_cache_key(user.id): UserResponse.model_validate(user).model_dump(mode="json")
+            for user in created
+        },
+        ttl=settings.CACHE_TTL_SECONDS,
+    )
+
+    errors.sort(key=lambda error: error.index)
+    return {"created": created, "errors": errors}
+
+
+def _duplicate_error(index: int) -> BatchError:
+    return BatchError(
+        index=index,
+        errors=[{"type": "unique", "loc": [], "msg": DUPLICATE_USER_DETAIL}],
+    )
+
+
+@router.get("/users/export", response_class=StreamingResponse)
+async def export_users(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    updated_since: datetime | None = None,
+    updated_before: datetime | None = None,
+) -> StreamingResponse:
+    """Stream users as NDJSON, optionally filtered for incremental sync."""
+    stmt = USER_ROWS.select().order_by(User.id)
+    if updated_since is not None:
+        stmt = stmt.where(User.updated_at >= updated_since)
+    if updated_before is not None:
+        stmt = stmt.where(User.updated_at < updated_before)
+
+    return StreamingResponse(
+        stream_ndjson(db, stmt, USER_ROWS),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
 @router.get("/users/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    request: Request,
+) -> Response:
     """Get user by ID."""
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
 
-    if not user:
+    async def load() -> dict[str, Any] | None:
+        return await user_loader.load(db, user_id)
+
+    user = await get_or_load(user_cache_key(user_id), load)
+
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    return user
+    # Validated against the cached payload, so an unchanged user costs no DB query
+    etag = resource_etag(user)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    # The cached payload was produced by UserResponse, so it is encoded as is
+    response = JSONBytesResponse(dumps(user))
+    set_validators(response, etag)
+    return response
@@ -0,0 +1,270 @@
+import zlib
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import CACHE_REQUESTS
+from app.services.local_cache import LocalCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional speedup
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional speedup
+    zstandard = None
+
+# Statuses that never carry a body
+NO_BODY_STATUSES = frozenset({204, 205, 304})
+
+_cache_hit = CACHE_REQUESTS.labels(tier="compression", result="hit")
+_cache_miss = CACHE_REQUESTS.labels(tier="compression", result="miss")
+
+
+class StreamCompressor(Protocol):
+    def compress(self, data: bytes, /) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _BrotliStream:
+    def __init__(self, quality: int) -> None:
+        if brotli is None:
+            raise RuntimeError("br encoding requires the brotli package")
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+@dataclass(frozen=True, slots=True)
+class Encoder:
+    """A ``Content-Encoding`` with one-shot and streaming compression."""
+
+    name: str
+    compress: Callable[[bytes], bytes]
+    stream: Callable[[], StreamCompressor]
+
+
+def gzip_encoder(level: int) -> Encoder:
+    return Encoder(
+        "gzip",
+        lambda data: zlib.compress(data, level, wbits=31),
+        lambda: zlib.compressobj(level, zlib.DEFLATED, 31),
+    )
+
+
+def brotli_encoder(level: int) -> Encoder:
+    if brotli is None:
+        raise RuntimeError("br encoding requires the brotli package")
+    compress = brotli.compress
+    return Encoder(
+        "br",
+        lambda data: compress(data, quality=level),
+        lambda: _BrotliStream(level),
+    )
+
+
+def zstd_encoder(level: int) -> Encoder:
+    if zstandard is None:
+        raise RuntimeError("zstd encoding requires the zstandard package")
+    compressor = zstandard.ZstdCompressor(level=level)
+    return Encoder("zstd", compressor.compress, compressor.compressobj)
+
+
+def build_encoders(names: Sequence[str]) -> list[Encoder]:
+    """Encoders for ``names`` in preference order, skipping uninstalled libraries."""
+    factories: dict[str, tuple[Any, Callable[[], Encoder]]] = {
+        "zstd": (zstandard, lambda: zstd_encoder(settings.COMPRESSION_ZSTD_LEVEL)),
+        "br": (brotli, lambda: brotli_encoder(settings.COMPRESSION_BROTLI_LEVEL)),
+        "gzip": (zlib, lambda: gzip_encoder(settings.COMPRESSION_GZIP_LEVEL)),
+    }
+    encoders = []
+    for name in names:
+        module, factory = factories[name]
+        if module is not None:
+            encoders.append(factory())
+    return encoders
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding: str, available: tuple[str, ...]) -> str | None:
+    """Pick the best of ``available`` for an ``Accept-Encoding`` header.
+
+    Highest q-value wins; ties go to the earlier entry in ``available``.
+    Clients send few distinct headers, so results are memoized.
+    """
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name := name.strip():
+            qualities[name] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for name in available:
+        quality = qualities.get(name, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing responses with the client's preferred encoding.
+
+    Bodies under ``minimum_size``, excluded content types, ``no-transform``
+    responses and already encoded ones are sent as is. Streamed bodies are
+    compressed chunk by chunk. When ``cache`` is given, compressed bodies of
+    GET responses carrying an ``ETag`` are kept there keyed by URL, ETag and
+    encoding, so a hot cached resource is compressed once rather than on
+    every hit.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encoders: Sequence[Encoder],
+        minimum_size: int = 1000,
+        excluded_content_types: Sequence[str] = (),
+        cache: LocalCache | None = None,
+    ) -> None:
+        self.app = app
+        self.encoders = {encoder.name: encoder for encoder in encoders}
+        self.available = tuple(self.encoders)
+        self.minimum_size = minimum_size
+        self.excluded_content_types = tuple(excluded_content_types)
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.encoders:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate(accept_encoding, self.available) if accept_encoding else None
+        responder = _Responder(self, scope, send, self.encoders.get(encoding or ""))
+        await self.app(scope, receive, responder)
+
+    def compressible(self, status: int, headers: Headers) -> bool:
+        """Whether a response may be compressed at all, judging by its headers."""
+        if status < 200 or status in NO_BODY_STATUSES or "content-encoding" in headers:
+            return False
+        if "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "")
+        return not content_type.startswith(self.excluded_content_types)
+
+    def compress(self, encoder: Encoder, body: bytes, scope: Scope, etag: str | None) -> bytes:
+        """Compress ``body``, reusing an earlier result for the same representation."""
+        if self.cache is None or etag is None or scope["method"] != "GET":
+            return encoder.compress(body)
+
+        key = f"{encoder.name} {scope['path']}?{scope['query_string'].decode()} {etag}"
+        entry = self.cache.get(key)
+        # The length check guards against an ETag that failed to change with the body
+        if entry is not None and entry[0] == len(body):
+            _cache_hit.inc()
+            return entry[1]
+
+        _cache_miss.inc()
+        compressed = encoder.compress(body)
+        self.cache.set(key, (len(body), compressed), len(compressed))
+        return compressed
+
+
+class _Responder:
+    """``send`` wrapper for one request: holds the response start until the body decides."""
+
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        scope: Scope,
+        send: Send,
+        encoder: Encoder | None,
+    ) -> None:
+        self.middleware = middleware
+        self.scope = scope
+        self.send = send
+        self.encoder = encoder
+        self.start: Message | None = None
+        self.stream: StreamCompressor | None = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if self.passthrough:
+            await self.send(message)
+        elif message["type"] == "http.response.start":
+            await self._on_start(message)
+        elif message["type"] == "http.response.body":
+            await self._on_body(message)
+        else:
+            await self.send(message)
+
+    async def _on_start(self, message: Message) -> None:
+        headers = MutableHeaders(raw=message.setdefault("headers", []))
+        if not self.middleware.compressible(message["status"], headers):
+            self.passthrough = True
+        elif self.encoder is None:
+            # Another client could have been sent a compressed representation
+            length = headers.get("content-length")
+            if length is None or int(length) >= self.middleware.minimum_size:
+                headers.add_vary_header("Accept-Encoding")
+            self.passthrough = True
+
+        if self.passthrough:
+            await self.send(message)
+        else:
+            self.start = message
+
+    async def _on_body(self, message: Message) -> None:
+        encoder, start = self.encoder, self.start
+        if encoder is None or start is None:
+            # Without an encoder or a held start _on_start has switched to passthrough
+            raise RuntimeError("http.response.body sent before http.response.start")
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.stream is not None:
+            chunk = self.stream.compress(body)
+            if not more_body:
+                chunk += self.stream.flush()
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            return
+
+        headers = MutableHeaders(raw=start["headers"])
+        if not more_body and len(body) < self.middleware.minimum_size:
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers["Content-Encoding"] = encoder.name
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            self.stream = encoder.stream()
+            del headers["Content-Length"]
+            body = self.stream.compress(body)
+        else:
+            body = self.middleware.compress(encoder, body, self.scope, headers.get("etag"))
+            headers["Content-Length"] = str(len(body))
+
+        await self.send(start)
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
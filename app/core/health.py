@@ -0,0 +1,104 @@
+import asyncio
+import contextlib
+import time
+from typing import Any
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db import session
+from app.services import cache
+
+logger = get_logger(__name__)
+
+# Latest dependency check results, refreshed in the background
+_checks: dict[str, str] = {}
+_checked_at: float | None = None
+_task: asyncio.Task[None] | None = None
+
+
+async def _check_database() -> None:
+    if session.engine is None:
+        raise RuntimeError("not initialized")
+    async with session.engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _check_redis() -> None:
+    if cache.redis_client is None:
+        raise RuntimeError("not initialized")
+    await cache.redis_client.ping()
+
+
+async def check_dependencies() -> dict[str, str]:
+    """Run every dependency check concurrently, bounded by the check timeout."""
+    names = ("database", "redis")
+    results = await asyncio.gather(
+        *(
+            asyncio.wait_for(check(), settings.HEALTH_CHECK_TIMEOUT_SECONDS)
+            for check in (_check_database, _check_redis)
+        ),
+        return_exceptions=True,
+    )
+    return {
+        name: "ok" if not isinstance(result, BaseException) else f"error: {type(result).__name__}"
+        for name, result in zip(names, results, strict=True)
+    }
+
+
+async def refresh() -> None:
+    """Run the checks once and publish the results."""
+    global _checks, _checked_at
+
+    checks = await check_dependencies()
+    # Replica health only steers reads; the primary keeps serving if all are down
+    await session.check_replicas()
+    if checks != _checks:
+        logger.info("Dependency status changed", **checks)
+    _checks = checks
+    _checked_at = time.monotonic()
+
+
+async def _run(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await refresh()
+        except Exception as e:  # keep checking; stale results mark us unready
+            logger.error("Dependency check failed", error=str(e))
+
+
+async def start_health_checks() -> None:
+    """Check dependencies now, then keep re-checking in the background."""
+    global _task
+
+    await refresh()
+    if _task is None:
+        _task = asyncio.create_task(_run(settings.HEALTH_CHECK_INTERVAL_SECONDS))
+
+
+async def stop_health_checks() -> None:
+    """Stop background checks and report not ready from now on."""
+    global _task, _checked_at
+
+    _checked_at = None
+    if _task is not None:
+        _task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _task
+        _task = None
+
+
+def get_readiness() -> tuple[bool, dict[str, Any]]:
+    """Readiness from the cached results; never touches the dependencies."""
+    if _checked_at is None:
+        return False, {"status": "starting", "checks": _checks}
+
+    # Results older than a few intervals mean the checker itself is stuck
+    max_age = settings.HEALTH_CHECK_INTERVAL_SECONDS * 3 + settings.HEALTH_CHECK_TIMEOUT_SECONDS
+    if time.monotonic() - _checked_at > max_age:
+        return False, {"status": "stale", "checks": _checks}
+
+    ready = all(result == "ok" for result in _checks.values())
+    return ready, {"status": "ready" if ready else "not ready", "checks": _checks}
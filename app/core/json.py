@@ -0,0 +1,26 @@
+import json
+from collections.abc import Callable
+from typing import Any
+
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def dumps(value: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+    """Encode ``value`` as JSON bytes, preferring orjson when installed.
+
+    ``default`` converts values neither encoder handles natively. Both
+    encoders render UTC datetimes with a ``Z`` suffix, like pydantic.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=default, option=orjson.OPT_UTC_Z)
+    return to_json(value, fallback=default)
+
+
+def loads(payload: bytes | str) -> Any:
+    """Decode JSON, preferring orjson when installed."""
+    return orjson.loads(payload) if orjson is not None else json.loads(payload)
@@ -1,31 +1,176 @@
+import atexit
 import logging
+import queue
 import sys
+import threading
+from collections.abc import Callable
+from typing import Any, BinaryIO
 
 import structlog
 
+from app.core import json
+from app.core.config import settings
+
+
+def _dumps(event: dict[str, Any]) -> bytes:
+    """Serialize an event dict to JSON bytes, stringifying unknown values."""
+    return json.dumps(event, default=str)
+
+
+class LogWriter:
+    """Background thread that serializes queued log events and writes them in batches.
+
+    The queue is bounded; when it is full new events are dropped and counted
+    rather than blocking the event loop.
+    """
+
+    _STOP = object()
+
+    def __init__(self, stream: BinaryIO, maxsize: int, batch_size: int) -> None:
+        self.stream = stream
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._stopped = False
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def enqueue(self, event: dict[str, Any]) -> None:
+        if self._stopped:
+            # Late events (e.g. during interpreter shutdown) are written inline
+            self._write([event])
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush pending events and stop the thread."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        self._stopped = True
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is self._STOP
+            self._write(batch[:-1] if stop else batch)
+            if stop:
+                return
+
+    def _write(self, events: list[dict[str, Any]]) -> None:
+        if not events:
+            return
+        try:
+            self.stream.write(b"".join(_dumps(event) + b"\n" for event in events))
+            self.stream.flush()
+        except Exception:  # never let a bad stream kill the writer
+            self.dropped += len(events)
+
+
+class QueueLogger:
+    """structlog logger that hands finished event dicts to a ``LogWriter``."""
+
+    def __init__(self, writer: LogWriter) -> None:
+        self._writer = writer
+
+    def msg(self, event: dict[str, Any]) -> None:
+        self._writer.enqueue(event)
+
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = error = critical = exception = msg
+
+
+class QueueLoggerFactory:
+    """Produce a shared ``QueueLogger`` for every structlog logger."""
+
+    def __init__(self, writer: LogWriter) -> None:
+        self._logger = QueueLogger(writer)
+
+    def __call__(self, *_args: Any) -> QueueLogger:
+        return self._logger
+
+
+def _hand_off(
+    _logger: Any, _method_name: str, event_dict: structlog.typing.EventDict
+) -> tuple[tuple[Any, ...], dict[str, Any]]:
+    """Final processor: pass the event dict through unrendered."""
+    return (event_dict,), {}
+
+
+_writer: LogWriter | None = None
+
 
 def setup_logging() -> None:
     """Configure structured logging."""
+    global _writer
+
+    shutdown_logging()
+
+    processors: list[Callable[..., Any]] = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+        structlog.processors.StackInfoRenderer(),
+        structlog.dev.set_exc_info,
+        structlog.processors.TimeStamper(fmt="iso"),
+    ]
+
+    if sys.stderr.isatty():
+        processors.append(structlog.dev.ConsoleRenderer())
+        logger_factory: Any = structlog.PrintLoggerFactory()
+    elif settings.LOG_ASYNC:
+        # The event loop only enqueues; rendering and I/O happen on the writer thread
+        _writer = LogWriter(sys.stdout.buffer, settings.LOG_QUEUE_SIZE, settings.LOG_BATCH_SIZE)
+        _writer.start()
+        processors += [structlog.processors.format_exc_info, _hand_off]
+        logger_factory = QueueLoggerFactory(_writer)
+    else:
+        processors += [
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=lambda event, **_kw: _dumps(event)),
+        ]
+        logger_factory = structlog.BytesLoggerFactory()
 
-    # Configure structlog
     structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.processors.add_log_level,
-            structlog.processors.StackInfoRenderer(),
-            structlog.dev.set_exc_info,
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.dev.ConsoleRenderer()
-            if sys.stderr.isatty()
-            else structlog.processors.JSONRenderer(),
-        ],
+        processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
-        cache_logger_on_first_use=False,
+        logger_factory=logger_factory,
+        cache_logger_on_first_use=True,
     )
 
 
+def shutdown_logging() -> None:
+    """Flush and stop the background log writer, if running."""
+    global _writer
+
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+
+def get_dropped_log_count() -> int:
+    """Number of log events dropped because the queue was full."""
+    return _writer.dropped if _writer is not None else 0
+
+
 def get_logger(name: str) -> structlog.BoundLogger:
     """Get a logger instance."""
     return structlog.get_logger(name)
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,185 @@
+import asyncio
+import contextlib
+import os
+import time
+from typing import Any
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import get_dropped_log_count, get_logger
+
+logger = get_logger(__name__)
+
+# Metric values live in this worker and are only updated from its event loop,
+# so the per-value locks prometheus_client takes are never contended. Setting
+# PROMETHEUS_MULTIPROC_DIR switches them to mmap files aggregated at scrape time.
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Database connections currently checked out",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Database connections open beyond DB_POOL_SIZE",
+    multiprocess_mode="livesum",
+)
+DB_BATCH_KEYS = Histogram(
+    "db_batch_load_keys",
+    "Keys per coalesced by-id query",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+REDIS_COMMAND_SECONDS = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency as seen by the cache service",
+    ["command"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by tier and result",
+    ["tier", "result"],
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the loop monitor was due to wake up and when it did",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+LOG_EVENTS_DROPPED = Gauge(
+    "log_events_dropped",
+    "Log events dropped because the async log queue was full",
+    multiprocess_mode="livesum",
+)
+
+_monitor_task: asyncio.Task[None] | None = None
+_pool: AsyncAdaptedQueuePool | None = None
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long checkouts wait for a connection."""
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request latency by route template."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._children: dict[tuple[str, str, int], Any] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            key = (scope["method"], _route_template(scope), status_code)
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = REQUEST_SECONDS.labels(*key)
+            child.observe(time.perf_counter() - start)
+
+
+def _route_template(scope: Scope) -> str:
+    """Full path template of the matched route, so IDs never become label values."""
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    # Routes of an included router may only know their path relative to the
+    # router prefix; recover the prefix from the concrete request path.
+    params = {name: str(value) for name, value in scope.get("path_params", {}).items()}
+    try:
+        suffix = template.format(**params)
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = scope["path"]
+    return path.removesuffix(suffix) + template if path.endswith(suffix) else template
+
+
+def track_pool(pool: Any) -> None:
+    """Report in-use and overflow counts for ``pool``."""
+    global _pool
+
+    _pool = pool if isinstance(pool, AsyncAdaptedQueuePool) else None
+
+
+async def _monitor(interval: float) -> None:
+    """Sample event-loop lag and pool/log gauges every ``interval`` seconds."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG_SECONDS.observe(max(0.0, time.perf_counter() - start - interval))
+
+        if _pool is not None:
+            DB_POOL_IN_USE.set(_pool.checkedout())
+            DB_POOL_OVERFLOW.set(max(0, _pool.overflow()))
+        LOG_EVENTS_DROPPED.set(get_dropped_log_count())
+
+
+def start_metrics() -> None:
+    """Start the background runtime sampler."""
+    global _monitor_task
+
+    if settings.METRICS_ENABLED and _monitor_task is None:
+        _monitor_task = asyncio.create_task(_monitor(settings.METRICS_SAMPLE_INTERVAL_SECONDS))
+
+
+async def stop_metrics() -> None:
+    """Stop the background runtime sampler."""
+    global _monitor_task
+
+    if _monitor_task is not None:
+        _monitor_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _monitor_task
+        _monitor_task = None
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Exposition payload and content type, aggregated across workers if configured."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
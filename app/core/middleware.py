@@ -1,41 +1,71 @@
+import random
 import time
-from collections.abc import Awaitable, Callable
 
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.core.compression import CompressionMiddleware, build_encoders
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import MetricsMiddleware
+from app.core.rate_limit import RateLimitMiddleware
+from app.services.local_cache import LocalCache
 
 logger = get_logger(__name__)
 
 
-async def logging_middleware(
-    request: Request,
-    call_next: Callable[[Request], Awaitable[Response]],
-) -> Response:
-    """Log request and response details."""
-    start_time = time.time()
+class RequestLoggingMiddleware:
+    """Pure ASGI middleware that times requests and logs their completion.
 
-    response = await call_next(request)
+    Sets ``X-Process-Time`` (seconds until the response starts) and logs
+    ``request_completed`` once the body has been sent. Successful requests are
+    logged with probability ``sample_rate``; 4xx/5xx are always logged.
+    """
 
-    process_time = time.time() - start_time
-    logger.info(
-        "request_completed",
-        method=request.method,
-        path=request.url.path,
-        status_code=response.status_code,
-        duration_ms=round(process_time * 1000, 2),
-    )
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = (time.perf_counter_ns() - start) / 1e9
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-process-time", str(process_time).encode()),
+                ]
+            await send(message)
 
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if status_code >= 400 or random.random() < self.sample_rate:
+                logger.info(
+                    "request_completed",
+                    method=scope["method"],
+                    path=scope["path"],
+                    status_code=status_code,
+                    duration_ms=round((time.perf_counter_ns() - start) / 1e6, 2),
+                )
 
 
 def setup_middleware(app: FastAPI) -> None:
     """Configure application middleware."""
 
+    # Rate limiting (innermost, so rejections still carry CORS headers)
+    if settings.RATE_LIMIT_ENABLED:
+        app.add_middleware(RateLimitMiddleware)
+
     # CORS
     app.add_middleware(
         CORSMiddleware,
@@ -43,10 +73,28 @@ def setup_middleware(app: FastAPI) -> None:
         allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
         allow_methods=settings.CORS_ALLOW_METHODS,
         allow_headers=settings.CORS_ALLOW_HEADERS,
+        expose_headers=settings.CORS_EXPOSE_HEADERS,
     )
 
     # Compression
-    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    compressed_bodies = None
+    if settings.COMPRESSION_CACHE_MAX_ENTRIES:
+        compressed_bodies = LocalCache(
+            max_entries=settings.COMPRESSION_CACHE_MAX_ENTRIES,
+            max_bytes=settings.COMPRESSION_CACHE_MAX_BYTES,
+            ttl=settings.COMPRESSION_CACHE_TTL_SECONDS,
+        )
+    app.add_middleware(
+        CompressionMiddleware,
+        encoders=build_encoders(settings.COMPRESSION_ENCODINGS),
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        excluded_content_types=settings.COMPRESSION_EXCLUDED_CONTENT_TYPES,
+        cache=compressed_bodies,
+    )
+
+    # Metrics
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
 
     # Logging
-    app.middleware("http")(logging_middleware)
+    app.add_middleware(RequestLoggingMiddleware, sample_rate=settings.LOG_SUCCESS_SAMPLE_RATE)
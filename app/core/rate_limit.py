@@ -0,0 +1,232 @@
+import json
+import math
+import time
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services import cache
+
+logger = get_logger(__name__)
+
+WINDOW_SECONDS = 60
+
+# Leases are pruned once this many keys are tracked in one worker
+MAX_TRACKED_LEASES = 10_000
+
+# GCRA over a one-minute window, reserving up to ARGV[3] tokens at once after
+# giving back ARGV[4] unspent tokens of the caller's previous reservation.
+# Uses the Redis clock so workers with skewed clocks agree. Times are in µs.
+# Returns {granted, remaining, reset_us, retry_after_us}.
+GCRA_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) * 1000000 + tonumber(now[2])
+local interval = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local refund = tonumber(ARGV[4])
+local period = interval * limit
+
+local tat = (tonumber(redis.call('GET', KEYS[1])) or now) - refund * interval
+if tat < now then
+  tat = now
+end
+
+local available = math.floor((now + period - tat) / interval)
+if available < 1 then
+  return {0, 0, tat - now, tat + interval - period - now}
+end
+
+local granted = math.min(requested, available)
+tat = tat + granted * interval
+redis.call('SET', KEYS[1], string.format('%.0f', tat), 'PX', math.ceil((tat - now) / 1000))
+return {granted, available - granted, tat - now, 0}
+"""
+
+
+@dataclass(slots=True)
+class RateLimitDecision:
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float
+    retry_after: float = 0.0
+
+    def headers(self) -> list[tuple[bytes, bytes]]:
+        """Standard ``RateLimit-*`` (and ``Retry-After`` when denied) headers."""
+        headers = [
+            (b"ratelimit-limit", str(self.limit).encode()),
+            (b"ratelimit-remaining", str(self.remaining).encode()),
+            (b"ratelimit-reset", str(math.ceil(self.reset)).encode()),
+        ]
+        if not self.allowed:
+            headers.append((b"retry-after", str(max(1, math.ceil(self.retry_after))).encode()))
+        return headers
+
+
+@dataclass(slots=True)
+class _Lease:
+    """Tokens reserved from Redis and spent locally by this worker."""
+
+    tokens: int
+    remaining: int
+    reset_at: float
+    expires_at: float
+
+
+class RateLimiter:
+    """Redis GCRA limiter with local token pre-allocation.
+
+    Each Redis round trip reserves a small batch of tokens for a key, which
+    this worker then hands out without touching Redis until the batch is spent
+    or the lease expires. Unspent tokens of an expired lease are given back
+    with the key's next reservation, so sparse traffic is not charged for
+    tokens it never used.
+    """
+
+    def __init__(self, batch_size: int, lease_seconds: float) -> None:
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self._leases: dict[str, _Lease] = {}
+        self._script_client: Redis | None = None
+        self._gcra: AsyncScript | None = None
+
+    async def acquire(self, redis: Redis, key: str, limit: int) -> RateLimitDecision:
+        """Take one token for ``key``."""
+        now = time.monotonic()
+        lease = self._leases.get(key)
+        if lease is not None and lease.tokens > 0 and now < lease.expires_at:
+            lease.tokens -= 1
+            return RateLimitDecision(
+                allowed=True,
+                limit=limit,
+                remaining=lease.remaining + lease.tokens,
+                reset=max(0.0, lease.reset_at - now),
+            )
+
+        # Never let one worker hoard more than a tenth of a key's budget
+        batch = max(1, min(self.batch_size, limit // 10))
+        refund = lease.tokens if lease is not None else 0
+        granted, remaining, reset_us, retry_us = await self._script(redis)(
+            keys=[key],
+            args=[WINDOW_SECONDS * 1_000_000 // limit, limit, batch, refund],
+        )
+        if not granted:
+            self._leases.pop(key, None)
+            return RateLimitDecision(
+                allowed=False,
+                limit=limit,
+                remaining=0,
+                reset=reset_us / 1e6,
+                retry_after=retry_us / 1e6,
+            )
+
+        if len(self._leases) >= MAX_TRACKED_LEASES:
+            self._prune(now)
+        self._leases[key] = _Lease(
+            tokens=granted - 1,
+            remaining=remaining,
+            reset_at=now + reset_us / 1e6,
+            expires_at=now + self.lease_seconds,
+        )
+        return RateLimitDecision(
+            allowed=True,
+            limit=limit,
+            remaining=remaining + granted - 1,
+            reset=reset_us / 1e6,
+        )
+
+    def _script(self, redis: Redis) -> AsyncScript:
+        if self._gcra is None or self._script_client is not redis:
+            self._gcra = redis.register_script(GCRA_SCRIPT)
+            self._script_client = redis
+        return self._gcra
+
+    def _prune(self, now: float) -> None:
+        self._leases = {key: lease for key, lease in self._leases.items() if lease.expires_at > now}
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware enforcing ``RATE_LIMIT_PER_MINUTE``.
+
+    Buckets are keyed by client (``RATE_LIMIT_CLIENT_HEADER`` or the peer
+    address) and by the longest matching prefix in ``RATE_LIMIT_ROUTES``.
+    Fails open when Redis is not configured or unreachable.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.limiter = RateLimiter(
+            batch_size=settings.RATE_LIMIT_LOCAL_BATCH,
+            lease_seconds=settings.RATE_LIMIT_LEASE_SECONDS,
+        )
+        self.routes = sorted(settings.RATE_LIMIT_ROUTES.items(), key=lambda r: -len(r[0]))
+        self.exempt = set(settings.RATE_LIMIT_EXEMPT_PATHS)
+        self.client_header = (
+            settings.RATE_LIMIT_CLIENT_HEADER.lower().encode()
+            if settings.RATE_LIMIT_CLIENT_HEADER
+            else None
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        redis = cache.redis_client
+        if scope["type"] != "http" or redis is None or scope["path"] in self.exempt:
+            await self.app(scope, receive, send)
+            return
+
+        bucket, limit = self._route_limit(scope["path"])
+        key = f"ratelimit:{bucket}:{self._client_id(scope)}"
+        try:
+            decision = await self.limiter.acquire(redis, key, limit)
+        except RedisError as e:
+            logger.warning("Rate limiter unavailable", error=str(e))
+            await self.app(scope, receive, send)
+            return
+
+        if not decision.allowed:
+            await self._reject(decision, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *decision.headers()]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def _route_limit(self, path: str) -> tuple[str, int]:
+        for prefix, limit in self.routes:
+            if path.startswith(prefix):
+                return prefix, limit
+        return "*", settings.RATE_LIMIT_PER_MINUTE
+
+    def _client_id(self, scope: Scope) -> str:
+        if self.client_header is not None:
+            for name, value in scope["headers"]:
+                if name == self.client_header:
+                    return value.decode("latin-1")
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    async def _reject(decision: RateLimitDecision, send: Send) -> None:
+        body = json.dumps({"detail": "Rate limit exceeded"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    *decision.headers(),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
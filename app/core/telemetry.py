@@ -1,36 +1,152 @@
+import random
+import threading
+from collections import OrderedDict
 from typing import Any
 
 from fastapi import FastAPI
-from opentelemetry import trace
+from opentelemetry import context, trace
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter
+from opentelemetry.sdk.trace.sampling import (
+    ALWAYS_OFF,
+    ALWAYS_ON,
+    ParentBased,
+    Sampler,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import StatusCode
 
 from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Local traces awaiting their root span before pending spans are dropped
+MAX_PENDING_TRACES = 10_000
 
-def setup_telemetry(app: FastAPI) -> None:
-    """Configure OpenTelemetry tracing."""
 
-    if not settings.OTEL_ENABLED:
-        logger.info("OpenTelemetry disabled")
-        return
+class TailSamplingSpanProcessor(SpanProcessor):
+    """Buffer each local trace until its root span ends, then keep or drop it whole.
+
+    A trace is exported when any of its spans errored, when the root took at
+    least ``latency_threshold_ms``, or otherwise with probability
+    ``success_ratio``. Only spans created in this process are considered; the
+    root is the first span without a local parent.
+    """
+
+    def __init__(
+        self,
+        delegate: SpanProcessor,
+        latency_threshold_ms: float,
+        success_ratio: float,
+        max_pending_traces: int = MAX_PENDING_TRACES,
+    ) -> None:
+        self.delegate = delegate
+        self.latency_threshold_ns = int(latency_threshold_ms * 1_000_000)
+        self.success_ratio = success_ratio
+        self.max_pending_traces = max_pending_traces
+        self.kept = 0
+        self.dropped = 0
+        self._pending: OrderedDict[int, list[ReadableSpan]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span, parent_context: context.Context | None = None) -> None:
+        self.delegate.on_start(span, parent_context=parent_context)
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if span.context is None:
+            # Nothing to group by; export it on its own rather than lose it
+            self.delegate.on_end(span)
+            return
+        trace_id = span.context.trace_id
+        if span.parent is not None and not span.parent.is_remote:
+            with self._lock:
+                spans = self._pending.get(trace_id)
+                if spans is None:
+                    if len(self._pending) >= self.max_pending_traces:
+                        _trace_id, evicted = self._pending.popitem(last=False)
+                        self.dropped += len(evicted)
+                    spans = self._pending[trace_id] = []
+                spans.append(span)
+            return
+
+        with self._lock:
+            spans = self._pending.pop(trace_id, [])
+        spans.append(span)
+
+        if self._keep(span, spans):
+            self.kept += 1
+            for finished in spans:
+                self.delegate.on_end(finished)
+        else:
+            self.dropped += len(spans)
+
+    def _keep(self, root: ReadableSpan, spans: list[ReadableSpan]) -> bool:
+        if any(s.status.status_code is StatusCode.ERROR for s in spans):
+            return True
+        if (root.end_time or 0) - (root.start_time or 0) >= self.latency_threshold_ns:
+            return True
+        return random.random() < self.success_ratio
+
+    def shutdown(self) -> None:
+        self.delegate.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.delegate.force_flush(timeout_millis)
+
 
-    # Create resource with service metadata
+def build_sampler(name: str, ratio: float) -> Sampler:
+    """Head sampler for an ``OTEL_TRACES_SAMPLER`` name."""
+    samplers: dict[str, Sampler] = {
+        "always_on": ALWAYS_ON,
+        "always_off": ALWAYS_OFF,
+        "traceidratio": TraceIdRatioBased(ratio),
+        "parentbased_always_on": ParentBased(ALWAYS_ON),
+        "parentbased_always_off": ParentBased(ALWAYS_OFF),
+        "parentbased_traceidratio": ParentBased(TraceIdRatioBased(ratio)),
+    }
+    return samplers[name]
+
+
+def create_tracer_provider(exporter: SpanExporter) -> TracerProvider:
+    """Tracer provider with the configured head sampler, tail sampler and batching."""
     resource = Resource.create(
         {
             "service.name": settings.OTEL_SERVICE_NAME,
             "service.version": settings.VERSION,
         }
     )
+    provider = TracerProvider(
+        resource=resource,
+        sampler=build_sampler(settings.OTEL_TRACES_SAMPLER, settings.OTEL_TRACES_SAMPLER_ARG),
+    )
+
+    processor: SpanProcessor = BatchSpanProcessor(
+        exporter,
+        max_queue_size=settings.OTEL_BSP_MAX_QUEUE_SIZE,
+        max_export_batch_size=settings.OTEL_BSP_MAX_EXPORT_BATCH_SIZE,
+        schedule_delay_millis=settings.OTEL_BSP_SCHEDULE_DELAY_MILLIS,
+        export_timeout_millis=settings.OTEL_BSP_EXPORT_TIMEOUT_MILLIS,
+    )
+    if settings.OTEL_TAIL_SAMPLING_ENABLED:
+        processor = TailSamplingSpanProcessor(
+            processor,
+            latency_threshold_ms=settings.OTEL_TAIL_LATENCY_THRESHOLD_MS,
+            success_ratio=settings.OTEL_TAIL_SUCCESS_RATIO,
+        )
+    provider.add_span_processor(processor)
+    return provider
+
 
-    # Setup tracer provider
-    provider = TracerProvider(resource=resource)
+def setup_telemetry(app: FastAPI) -> None:
+    """Configure OpenTelemetry tracing."""
+
+    if not settings.OTEL_ENABLED:
+        logger.info("OpenTelemetry disabled")
+        return
 
     # Configure OTLP exporter (Jaeger/Tempo)
     try:
@@ -38,15 +154,20 @@ def setup_telemetry(app: FastAPI) -> None:
             endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT,
             insecure=True,
         )
-        provider.add_span_processor(BatchSpanProcessor(exporter))
+        provider = create_tracer_provider(exporter)
         trace.set_tracer_provider(provider)
 
-        # Instrument FastAPI
-        FastAPIInstrumentor.instrument_app(app)
+        # Instrument FastAPI; per-message ASGI send/receive spans add cost but no insight
+        FastAPIInstrumentor.instrument_app(
+            app, tracer_provider=provider, exclude_spans=["receive", "send"]
+        )
 
         logger.info(
             "OpenTelemetry configured",
             endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT,
+            sampler=settings.OTEL_TRACES_SAMPLER,
+            ratio=settings.OTEL_TRACES_SAMPLER_ARG,
+            tail_sampling=settings.OTEL_TAIL_SAMPLING_ENABLED,
         )
     except Exception as e:
         logger.error("Failed to setup OpenTelemetry", error=str(e))
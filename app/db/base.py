@@ -1,7 +1,23 @@
 from datetime import datetime
+from typing import Any
 
 from sqlalchemy import DateTime, func
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.functions import now
+
+
+@compiles(now, "sqlite")
+def _sqlite_now(_element: now, _compiler: SQLCompiler, **_kw: Any) -> str:
+    """``now()`` in the format SQLAlchemy stores datetimes in on SQLite.
+
+    SQLite keeps datetimes as text, and its ``CURRENT_TIMESTAMP`` has no
+    fractional seconds. Keyset cursors bind ``YYYY-MM-DD HH:MM:SS.ffffff``, so
+    rows timestamped by the database must be stored the same way or ties on
+    ``created_at`` compare as smaller than the cursor and are skipped.
+    """
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now') || '000'"
 
 
 class Base(DeclarativeBase):
@@ -11,7 +27,13 @@ class Base(DeclarativeBase):
 
 
 class TimestampMixin:
-    """Mixin for created_at and updated_at timestamps."""
+    """Mixin for created_at and updated_at timestamps.
+
+    Server-generated values are fetched in the same statement that writes the
+    row (``RETURNING``), so flushed objects never need a follow-up refresh.
+    """
+
+    __mapper_args__ = {"eager_defaults": True}
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -0,0 +1,18 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.models.item import Item
+from app.models.user import User
+from app.schemas.item import ItemResponse
+from app.schemas.user import UserResponse
+
+
+def schema_columns(model: type[Any], schema: type[BaseModel]) -> tuple[Any, ...]:
+    """Columns of ``model`` named like ``schema``'s fields, in field order."""
+    return tuple(getattr(model, name) for name in schema.model_fields)
+
+
+# What the read paths select, so rows can be encoded without building models
+ITEM_COLUMNS = schema_columns(Item, ItemResponse)
+USER_COLUMNS = schema_columns(User, UserResponse)
@@ -0,0 +1,39 @@
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def insert_ignoring_conflicts(
+    db: AsyncSession, model: Any, rows: Sequence[Mapping[str, Any]]
+) -> list[Any]:
+    """Insert ``rows``, skipping any that hit a unique constraint; returns the inserted objects.
+
+    On Postgres and SQLite (3.35+, the stand-in for tests) this is one
+    ``INSERT ... ON CONFLICT DO NOTHING ... RETURNING``, so uniqueness is
+    checked atomically in the same round trip as the insert. Other dialects
+    insert row by row, each in a savepoint that a conflict rolls back.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(model).on_conflict_do_nothing().returning(model)
+        return list((await db.scalars(stmt, list(rows))).all())
+    return await _insert_each(db, model, rows)
+
+
+async def _insert_each(
+    db: AsyncSession, model: Any, rows: Sequence[Mapping[str, Any]]
+) -> list[Any]:
+    inserted = []
+    for row in rows:
+        obj = model(**row)
+        try:
+            async with db.begin_nested():
+                db.add(obj)
+        except IntegrityError:
+            continue
+        inserted.append(obj)
+    return inserted
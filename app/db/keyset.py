@@ -0,0 +1,36 @@
+from typing import Any, Literal
+
+from sqlalchemy import Integer, Select, bindparam, tuple_
+
+from app.db.search import SearchMode
+
+SortKey = Literal["id", "created_at"]
+
+# Keyset columns per sort key; the primary key always breaks ties
+KEYSET_COLUMNS: dict[SortKey | SearchMode, tuple[str, ...]] = {
+    "id": ("id",),
+    "created_at": ("created_at", "id"),
+    # Search results, best first by rank
+    "fts": ("rank", "id"),
+    "trigram": ("rank", "id"),
+}
+
+
+def page_statement(
+    stmt: Select[*tuple[Any, ...]], model: Any, *, order_by: SortKey, keyset: bool, offset: bool
+) -> Select[*tuple[Any, ...]]:
+    """Apply deterministic ordering plus keyset or offset pagination with bound parameters.
+
+    The result takes ``limit`` and either the cursor's ``after_*`` keyset or
+    ``offset`` as parameters (see ``app.api.pagination.page_params``), so one
+    statement serves every page of the same shape and can be built once.
+    """
+    columns = [getattr(model, name) for name in KEYSET_COLUMNS[order_by]]
+    stmt = stmt.order_by(*columns).limit(bindparam("limit", type_=Integer))
+
+    if keyset:
+        bounds = [bindparam(f"after_{column.key}", type_=column.type) for column in columns]
+        if len(columns) == 1:
+            return stmt.where(columns[0] > bounds[0])
+        return stmt.where(tuple_(*columns) > tuple_(*bounds))
+    return stmt.offset(bindparam("offset", type_=Integer)) if offset else stmt
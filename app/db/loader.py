@@ -0,0 +1,133 @@
+import asyncio
+import weakref
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import ColumnElement, Row, Select, any_, bindparam
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import DB_BATCH_KEYS
+
+# Loads the values for a batch of keys; keys without a row are left out
+type Fetch[K, V] = Callable[[AsyncSession, list[K]], Awaitable[dict[K, V]]]
+
+
+def id_in(column: Any, dialect: str) -> ColumnElement[bool]:
+    """``column = ANY(:ids)`` on Postgres, ``column IN (...)`` elsewhere.
+
+    ``ANY`` binds the ids as one array, so every batch size shares a single
+    statement (and prepared statement) instead of one per number of ids.
+    Either way the ids are passed as the ``ids`` parameter at execution.
+    """
+    if dialect == "postgresql":
+        return column == any_(bindparam("ids", type_=postgresql.ARRAY(column.type)))
+    return column.in_(bindparam("ids", expanding=True))
+
+
+def rows_by_id[V](
+    statement: Callable[[str], Select[*tuple[Any, ...]]],
+    column: Any,
+    to_value: Callable[[Row[Any]], V],
+) -> Fetch[Any, V]:
+    """Fetch function loading rows by id with ``statement(dialect)``.
+
+    The statement takes the ids as its ``ids`` parameter (see ``id_in``)
+    and must select ``column``.
+    """
+
+    async def fetch(db: AsyncSession, ids: list[Any]) -> dict[Any, V]:
+        result = await db.execute(statement(db.get_bind().dialect.name), {"ids": ids})
+        return {row._mapping[column]: to_value(row) for row in result}
+
+    return fetch
+
+
+@dataclass
+class _Batch[K, V]:
+    engine: AsyncEngine
+    futures: dict[K, asyncio.Future[V | None]] = field(default_factory=dict)
+
+
+class BatchLoader[K, V]:
+    """DataLoader-style coalescing of concurrent by-key lookups.
+
+    Keys requested by concurrent callers within ``window`` seconds are loaded
+    with a single ``fetch`` call on a session of its own, so N concurrent
+    lookups cost one pool checkout and one query instead of N. Lookups are
+    batched per event loop and per engine: a request routed to the primary
+    (read-your-writes) is never answered from a replica. A batch reaching
+    ``max_size`` keys is closed and later keys start a new one.
+    """
+
+    def __init__(
+        self,
+        fetch: Fetch[K, V],
+        window: float = settings.DB_BATCH_WINDOW_SECONDS,
+        max_size: int = settings.DB_BATCH_MAX_SIZE,
+    ) -> None:
+        self.fetch = fetch
+        self.window = window
+        self.max_size = max_size
+        self._open: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[AsyncEngine, _Batch[K, V]]
+        ] = weakref.WeakKeyDictionary()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, db: AsyncSession, key: K) -> V | None:
+        """Value for ``key``, or None if no row has it."""
+        return (await self.load_many(db, [key]))[0]
+
+    async def load_many(self, db: AsyncSession, keys: Sequence[K]) -> list[V | None]:
+        """Values for ``keys`` in order, with None for missing rows.
+
+        ``db`` only selects the engine; the query runs on a separate session,
+        so it may outlive the request that opened the batch.
+        """
+        engine = db.bind
+        if not isinstance(engine, AsyncEngine):
+            raise RuntimeError("BatchLoader needs a session bound to an AsyncEngine")
+        futures = [self._enqueue(engine, key) for key in keys]
+        # Shield so one cancelled caller does not fail everyone waiting on the key
+        return list(await asyncio.shield(asyncio.gather(*futures)))
+
+    def _enqueue(self, engine: AsyncEngine, key: K) -> asyncio.Future[V | None]:
+        loop = asyncio.get_running_loop()
+        batches = self._open.setdefault(loop, {})
+        batch = batches.get(engine)
+        if batch is None:
+            batch = batches[engine] = _Batch(engine)
+            task = loop.create_task(self._dispatch(batches, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        future = batch.futures.get(key)
+        if future is None:
+            future = batch.futures[key] = loop.create_future()
+            if len(batch.futures) >= self.max_size:
+                batches.pop(engine, None)
+        return future
+
+    async def _dispatch(
+        self, batches: dict[AsyncEngine, _Batch[K, V]], batch: _Batch[K, V]
+    ) -> None:
+        await asyncio.sleep(self.window)
+        if batches.get(batch.engine) is batch:
+            del batches[batch.engine]
+
+        keys = list(batch.futures)
+        DB_BATCH_KEYS.observe(len(keys))
+        try:
+            async with AsyncSession(batch.engine) as db:
+                values = await self.fetch(db, keys)
+        except Exception as e:
+            for future in batch.futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in batch.futures.items():
+            if not future.done():
+                future.set_result(values.get(key))
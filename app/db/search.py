@@ -0,0 +1,142 @@
+"""Full-text search over item names and descriptions.
+
+On Postgres, items carry a generated ``search_vector`` tsvector (name weighted
+above description) with a GIN index, plus a trigram GIN index on ``name`` for
+prefix and fuzzy fallback matches. SQLite, used for tests, gets an FTS5 table
+kept in sync by triggers instead. Neither is declared on the ``Item`` model:
+they are created along with the table here and by the migrations, and hidden
+from autogenerate by ``include_object``.
+"""
+
+import re
+from typing import Any, Literal
+
+from sqlalchemy import (
+    DDL,
+    Float,
+    Select,
+    and_,
+    event,
+    func,
+    literal,
+    literal_column,
+    or_,
+    table,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from app.models.item import Item
+
+SearchMode = Literal["fts", "trigram"]
+
+# Text search configuration: no stemming or stop words, names are not prose
+TEXT_SEARCH_CONFIG = "simple"
+
+POSTGRES_DDL = (
+    f"""ALTER TABLE items ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(description, '')), 'B')
+    ) STORED""",
+    "CREATE INDEX ix_items_search_vector ON items USING gin (search_vector)",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_items_name_trgm ON items USING gin (name gin_trgm_ops)",
+)
+
+SQLITE_DDL = (
+    """CREATE VIRTUAL TABLE items_fts USING fts5(
+        name, description, content='items', content_rowid='id'
+    )""",
+    """CREATE TRIGGER items_fts_insert AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    """CREATE TRIGGER items_fts_delete AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts (items_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    """CREATE TRIGGER items_fts_update AFTER UPDATE ON items BEGIN
+        INSERT INTO items_fts (items_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO items_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+)
+
+# Schema objects managed here and in migrations rather than on the models
+UNMANAGED_NAMES = frozenset({"search_vector", "ix_items_search_vector", "ix_items_name_trgm"})
+# FTS5 keeps its index in shadow tables named after the virtual table
+UNMANAGED_TABLE_PREFIX = "items_fts"
+
+for _statement in POSTGRES_DDL:
+    event.listen(Item.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_DDL:
+    event.listen(Item.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+# The FTS table outlives items otherwise, with entries for ids that get reused
+event.listen(
+    Item.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS items_fts").execute_if(dialect="sqlite"),
+)
+
+_search_vector = literal_column("items.search_vector", TSVECTOR)
+_items_fts = table("items_fts")
+
+
+def include_object(
+    _object: Any, name: str | None, type_: str, reflected: bool, _compare_to: Any
+) -> bool:
+    """Alembic ``include_object`` hook hiding the search objects from autogenerate."""
+    if not reflected or name is None:
+        return True
+    if type_ == "table":
+        return not name.startswith(UNMANAGED_TABLE_PREFIX)
+    return name not in UNMANAGED_NAMES
+
+
+def search_terms(q: str) -> list[str]:
+    """Lowercased words of a query; punctuation never reaches the query syntax."""
+    return re.findall(r"\w+", q.lower())
+
+
+def search_query(
+    stmt: Select[*tuple[Any, ...]],
+    q: str,
+    *,
+    mode: SearchMode,
+    dialect: str,
+    limit: int,
+    after: tuple[float, int] | None = None,
+) -> Select[*tuple[Any, ...]]:
+    """Add matching, a trailing ``rank`` column and (rank, id) keyset paging to ``stmt``.
+
+    ``fts`` matches every word of ``q`` as a prefix and ranks by relevance;
+    ``trigram`` matches names resembling ``q`` and ranks by similarity. Rows
+    come best first, ties by id, starting after the ``(rank, id)`` keyset.
+    """
+    terms = search_terms(q)
+    if mode == "fts" and dialect == "postgresql":
+        query = func.to_tsquery(TEXT_SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms))
+        rank = func.ts_rank_cd(_search_vector, query)
+        stmt = stmt.where(_search_vector.bool_op("@@")(query))
+    elif mode == "fts":
+        # bm25 is lower for better matches; name hits count ten times as much
+        rank = -func.bm25(literal_column("items_fts"), 10.0, 1.0)
+        stmt = stmt.join(_items_fts, literal_column("items_fts.rowid") == Item.id).where(
+            literal_column("items_fts").op("MATCH")(" ".join(f'"{term}"*' for term in terms))
+        )
+    elif dialect == "postgresql":
+        # word_similarity finds q as a prefix or a misspelling within the name
+        text = " ".join(terms)
+        rank = func.word_similarity(text, Item.name)
+        stmt = stmt.where(literal(text).bool_op("<%")(Item.name))
+    else:
+        # Substring match stands in for trigram similarity in tests
+        rank = literal(0.0, Float)
+        stmt = stmt.where(and_(*(Item.name.icontains(term, autoescape=True) for term in terms)))
+
+    rank = rank.label("rank")
+    stmt = stmt.add_columns(rank).order_by(rank.desc(), Item.id).limit(limit)
+    if after is not None:
+        after_rank, after_id = after
+        stmt = stmt.where(or_(rank < after_rank, and_(rank == after_rank, Item.id > after_id)))
+    return stmt
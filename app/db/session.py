@@ -1,37 +1,190 @@
-from collections.abc import AsyncGenerator
+import asyncio
+import itertools
+import time
+import uuid
+from collections.abc import AsyncGenerator, Awaitable, Sequence
+from dataclasses import dataclass
 from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request, Response
+from sqlalchemy import Executable, make_url, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import InstrumentedQueuePool, track_pool
+from app.db.queries import hot_queries
 
 logger = get_logger(__name__)
 
+# Cookie marking a client that wrote recently; its reads go to the primary
+READ_YOUR_WRITES_COOKIE = "db_rw_until"
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Seconds a replica is behind the primary; zero when it has replayed all WAL it received
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReadSession(AsyncSession):
+    """Session for reads that holds a pooled connection only while a query runs.
+
+    Like any session it checks a connection out on its first query, so a
+    request answered from cache never touches the pool. Unlike one, it ends
+    its transaction as soon as each query returns (results are buffered by
+    then), handing the connection back while the handler serializes, waits
+    on Redis or sends the response. Queries of one request may therefore
+    see different snapshots. Streams keep their connection until the session
+    closes.
+    """
+
+    async def _release[T](self, query: Awaitable[T]) -> T:
+        try:
+            result = await query
+        except Exception:
+            await self.rollback()
+            raise
+        # Nothing to flush, and expire_on_commit=False keeps loaded objects usable
+        await self.commit()
+        return result
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._release(super().execute(*args, **kwargs))
+
+    async def scalar(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._release(super().scalar(*args, **kwargs))
+
+    async def get(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._release(super().get(*args, **kwargs))
+
+
+@dataclass
+class Replica:
+    """A read replica's session factory and last observed health."""
+
+    url: str
+    engine: AsyncEngine
+    session_maker: async_sessionmaker[AsyncSession]
+    healthy: bool = True
+    lag: float = 0.0
+
+
 engine: Any | None = None
 async_session_maker: async_sessionmaker[AsyncSession] | None = None
+# Reads routed to the primary (no healthy replica, or read-your-writes)
+primary_read_session_maker: async_sessionmaker[AsyncSession] | None = None
+replicas: list[Replica] = []
+_round_robin = itertools.count()
 
 
-async def init_db_pool() -> None:
-    """Initialize database connection pool."""
-    global engine, async_session_maker
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
 
-    logger.info("Initializing database pool", url=str(settings.DATABASE_URL))
 
-    engine = create_async_engine(
-        str(settings.DATABASE_URL),
+def driver_connect_args(url: str) -> dict[str, Any]:
+    """asyncpg statement caching: sized by settings, or off for PgBouncer."""
+    if make_url(url).get_driver_name() != "asyncpg":
+        return {}
+    if settings.DB_PGBOUNCER_MODE:
+        # A transaction pooler may run each statement on a different server
+        # connection, where a cached prepared statement does not exist
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    return {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+
+
+def _create_engine(url: str, **kwargs: Any) -> AsyncEngine:
+    return create_async_engine(
+        url,
         pool_size=settings.DB_POOL_SIZE,
         max_overflow=settings.DB_MAX_OVERFLOW,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        connect_args=driver_connect_args(url),
         echo=False,
+        **kwargs,
     )
 
-    async_session_maker = async_sessionmaker(
-        engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
+
+def _session_maker(
+    bind: AsyncEngine, class_: type[AsyncSession] = AsyncSession
+) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind, class_=class_, expire_on_commit=False)
+
+
+async def init_db_pool() -> None:
+    """Initialize database connection pool."""
+    global engine, async_session_maker, primary_read_session_maker, replicas
+
+    logger.info("Initializing database pool", url=str(settings.DATABASE_URL))
+
+    engine = _create_engine(
+        str(settings.DATABASE_URL),
+        **({"poolclass": InstrumentedQueuePool} if settings.METRICS_ENABLED else {}),
     )
+    track_pool(engine.pool)
+    async_session_maker = _session_maker(engine)
+    primary_read_session_maker = _session_maker(engine, ReadSession)
+
+    replicas = []
+    for url in settings.DATABASE_REPLICA_URLS:
+        replica_engine = _create_engine(str(url))
+        replicas.append(
+            Replica(str(url), replica_engine, _session_maker(replica_engine, ReadSession))
+        )
+
+    logger.info("Database pool initialized", replicas=len(replicas))
+
+    if settings.DB_POOL_WARMUP:
+        for target in (engine, *(replica.engine for replica in replicas)):
+            try:
+                await warm_db_pool(target)
+            except (SQLAlchemyError, OSError) as e:
+                # Start anyway: /ready reports the database until it is back
+                logger.warning(
+                    "Database pool warm-up failed",
+                    url=str(target.url),
+                    error=str(e),
+                )
 
-    logger.info("Database pool initialized")
+
+async def _prime(
+    conn: AsyncConnection, statements: Sequence[tuple[Executable, dict[str, Any]]]
+) -> None:
+    # Populates SQLAlchemy's compiled cache and the driver's per-connection
+    # prepared statement cache, so first requests skip both
+    for stmt, params in statements:
+        await conn.execute(stmt, params)
+
+
+async def warm_db_pool(target: AsyncEngine | None = None) -> None:
+    """Open ``DB_POOL_SIZE`` connections up front and prime the hot queries on each."""
+    target = target or engine
+    if target is None:
+        raise RuntimeError("Database not initialized")
+
+    statements = hot_queries(target.dialect.name)
+    conns = [target.connect() for _ in range(settings.DB_POOL_SIZE)]
+    try:
+        await asyncio.gather(*(conn.start() for conn in conns))
+        await asyncio.gather(*(_prime(conn, statements) for conn in conns))
+    finally:
+        # Closing returns each connection to the pool rather than disconnecting it
+        await asyncio.gather(*(conn.close() for conn in conns if conn.sync_connection is not None))
+
+    logger.info("Database pool warmed", connections=len(conns))
 
 
 async def close_db_pool() -> None:
@@ -41,19 +194,83 @@ async def close_db_pool() -> None:
     if engine:
         logger.info("Closing database pool")
         await engine.dispose()
+        for replica in replicas:
+            await replica.engine.dispose()
         logger.info("Database pool closed")
 
 
-async def get_db() -> AsyncGenerator[AsyncSession]:
-    """Get database session dependency."""
-    if async_session_maker is None:
-        raise RuntimeError("Database not initialized")
+async def _replica_lag(replica: Replica) -> float:
+    async with replica.engine.connect() as conn:
+        if conn.dialect.name != "postgresql":
+            await conn.execute(text("SELECT 1"))
+            return 0.0
+        return float((await conn.execute(REPLICA_LAG_SQL)).scalar_one())
+
 
-    async with async_session_maker() as session:
+async def check_replicas() -> None:
+    """Refresh each replica's health and replication lag."""
+    for replica in replicas:
         try:
-            yield session
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+            replica.lag = await asyncio.wait_for(
+                _replica_lag(replica), settings.HEALTH_CHECK_TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            if replica.healthy:
+                logger.warning("Replica unavailable", url=replica.url, error=str(e))
+            replica.healthy = False
+            continue
+
+        healthy = replica.lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+        if healthy != replica.healthy:
+            logger.info("Replica status changed", url=replica.url, healthy=healthy, lag=replica.lag)
+        replica.healthy = healthy
+
+
+def read_session_maker(request: Request) -> async_sessionmaker[AsyncSession] | None:
+    """Session factory for a read: a healthy replica, or the primary after a recent write."""
+    candidates = [replica for replica in replicas if replica.healthy]
+    if not candidates or _wrote_recently(request):
+        return primary_read_session_maker
+    return candidates[next(_round_robin) % len(candidates)].session_maker
+
+
+def _wrote_recently(request: Request) -> bool:
+    until = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+
+def _mark_write(response: Response) -> None:
+    window = settings.DB_READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        str(int(time.time() + window)),
+        max_age=int(window),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def _new_session(maker: async_sessionmaker[AsyncSession] | None) -> AsyncSession:
+    if maker is None:
+        raise RuntimeError("Database not initialized")
+    return maker()
+
+
+async def get_db(request: Request, response: Response) -> AsyncGenerator[AsyncSession]:
+    """Get database session dependency (primary)."""
+    if replicas and request.method not in SAFE_METHODS:
+        # Route this client's reads to the primary until replicas catch up
+        _mark_write(response)
+
+    # Closing rolls back anything left uncommitted and returns the connection
+    async with _new_session(async_session_maker) as session:
+        yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession]:
+    """Get a ``ReadSession``, on a replica when possible, for read-only handlers."""
+    async with _new_session(read_session_maker(request)) as session:
+        yield session
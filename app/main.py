@@ -1,11 +1,14 @@
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from typing import Any
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, status
 
 from app.api.v1 import items, users
 from app.core.config import settings
-from app.core.logging import setup_logging
+from app.core.health import get_readiness, start_health_checks, stop_health_checks
+from app.core.logging import setup_logging, shutdown_logging
+from app.core.metrics import render_metrics, start_metrics, stop_metrics
 from app.core.middleware import setup_middleware
 from app.core.telemetry import setup_telemetry
 from app.db.session import close_db_pool, init_db_pool
@@ -19,12 +22,17 @@ async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
     setup_logging()
     await init_db_pool()
     await init_cache()
+    await start_health_checks()
+    start_metrics()
 
     yield
 
     # Shutdown
+    await stop_metrics()
+    await stop_health_checks()
     await close_cache()
     await close_db_pool()
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -49,7 +57,17 @@ async def health() -> dict[str, str]:
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus metrics endpoint."""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
 @app.get("/ready")
-async def ready() -> dict[str, str]:
-    """Readiness check endpoint."""
-    return {"status": "ready"}
+async def ready(response: Response) -> dict[str, Any]:
+    """Readiness check endpoint, served from the background dependency checks."""
+    is_ready, body = get_readiness()
+    if not is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return body
@@ -1,4 +1,4 @@
-from sqlalchemy import String, Text
+from sqlalchemy import Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base, TimestampMixin
@@ -8,8 +8,13 @@ class Item(Base, TimestampMixin):
     """Item model."""
 
     __tablename__ = "items"
+    __table_args__ = (
+        Index("ix_items_created_at_id", "created_at", "id"),
+        # Owner-scoped listing in created_at order; also serves plain owner_id lookups
+        Index("ix_items_owner_id_created_at_id", "owner_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    owner_id: Mapped[int] = mapped_column(nullable=False, index=True)
+    owner_id: Mapped[int] = mapped_column(nullable=False)
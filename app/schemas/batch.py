@@ -0,0 +1,10 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class BatchError(BaseModel):
+    """Schema for a row rejected from a batch request."""
+
+    index: int
+    errors: list[dict[str, Any]]
@@ -2,6 +2,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.schemas.batch import BatchError
+
 
 class ItemBase(BaseModel):
     """Base item schema."""
@@ -32,3 +34,10 @@ class ItemResponse(ItemBase):
     owner_id: int
     created_at: datetime
     updated_at: datetime
+
+
+class ItemBatchResponse(BaseModel):
+    """Schema for batch create response."""
+
+    created: list[ItemResponse]
+    errors: list[BatchError]
@@ -2,6 +2,8 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
+from app.schemas.batch import BatchError
+
 
 class UserBase(BaseModel):
     """Base user schema."""
@@ -35,3 +37,10 @@ class UserResponse(UserBase):
     is_active: bool
     created_at: datetime
     updated_at: datetime
+
+
+class UserBatchResponse(BaseModel):
+    """Schema for batch create response."""
+
+    created: list[UserResponse]
+    errors: list[BatchError]
@@ -0,0 +1,301 @@
+"""Pre-forking production server.
+
+Usage: python -m app.serve [--workers N] [--host HOST] [--port PORT] [--reuse-port]
+
+Runs ``WORKERS`` uvicorn processes behind a small supervisor that restarts
+crashed workers, rolls all workers on SIGHUP and drains them on SIGTERM/SIGINT.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from multiprocessing.context import SpawnProcess
+from multiprocessing.synchronize import Event
+from types import FrameType
+from typing import Any
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.logging import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+APP = "app.main:app"
+
+# Supervisor poll interval and how long a new worker may take to start serving
+TICK_SECONDS = 0.5
+STARTUP_TIMEOUT_SECONDS = 60.0
+
+# Workers dying faster than this are restarted with a delay instead of in a loop
+MIN_WORKER_LIFETIME_SECONDS = 5.0
+
+_spawn = multiprocessing.get_context("spawn")
+
+
+def worker_pool_sizes(
+    budget: int | None, workers: int, pool_size: int, max_overflow: int
+) -> tuple[int, int]:
+    """Per-worker ``(pool_size, max_overflow)`` keeping ``workers`` pools within ``budget``."""
+    if budget is None:
+        return pool_size, max_overflow
+    per_worker = max(1, budget // workers)
+    size = min(pool_size, per_worker)
+    return size, min(max_overflow, per_worker - size)
+
+
+def _pick(module: str, preferred: str, fallback: str) -> str:
+    return preferred if importlib.util.find_spec(module) is not None else fallback
+
+
+def bind_socket(host: str, port: int, reuse_port: bool) -> socket.socket:
+    """Listening socket, optionally with SO_REUSEPORT so each worker can bind its own."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+class _Server(uvicorn.Server):
+    """uvicorn server that tells the supervisor once it is accepting requests."""
+
+    def __init__(self, config: uvicorn.Config, started: Event) -> None:
+        super().__init__(config)
+        self._started_event = started
+
+    async def startup(self, sockets: list[socket.socket] | None = None) -> None:
+        await super().startup(sockets)
+        if self.started:
+            self._started_event.set()
+
+
+def _run_worker(
+    app: str,
+    sock: socket.socket | None,
+    host: str,
+    port: int,
+    started: Event,
+) -> None:
+    """Worker process entry point."""
+    if sock is None:
+        # SO_REUSEPORT: every worker has its own accept queue and the kernel
+        # balances connections across them
+        sock = bind_socket(host, port, reuse_port=True)
+
+    config = uvicorn.Config(
+        app,
+        loop=_pick("uvloop", "uvloop", "asyncio"),
+        http=_pick("httptools", "httptools", "h11"),
+        lifespan="on",
+        # RequestLoggingMiddleware already logs every request
+        access_log=False,
+        timeout_graceful_shutdown=int(settings.WORKER_GRACEFUL_TIMEOUT_SECONDS),
+    )
+    _Server(config, started).run(sockets=[sock])
+
+
+@dataclass
+class _Worker:
+    process: SpawnProcess
+    started: Event
+    spawned_at: float = field(default_factory=time.monotonic)
+    stopping: bool = False
+
+
+class Supervisor:
+    """Keep ``workers`` processes serving ``app`` on one address."""
+
+    def __init__(self, app: str, workers: int, host: str, port: int, reuse_port: bool) -> None:
+        self.app = app
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.reuse_port = reuse_port
+        self.sock: socket.socket | None = None
+        self.processes: list[_Worker] = []
+        self._should_exit = False
+        self._should_reload = False
+
+    def run(self) -> None:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self._handle_exit)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        if not self.reuse_port:
+            # One shared listening socket inherited by every worker
+            self.sock = bind_socket(self.host, self.port, reuse_port=False)
+
+        logger.info(
+            "Starting workers",
+            workers=self.workers,
+            address=f"{self.host}:{self.port}",
+            reuse_port=self.reuse_port,
+            loop=_pick("uvloop", "uvloop", "asyncio"),
+            http=_pick("httptools", "httptools", "h11"),
+        )
+        self.processes = [self._spawn() for _ in range(self.workers)]
+
+        try:
+            while not self._should_exit:
+                if self._should_reload:
+                    self._should_reload = False
+                    self._rolling_restart()
+                self._replace_dead_workers()
+                time.sleep(TICK_SECONDS)
+        finally:
+            self._stop_all()
+
+    def _spawn(self) -> _Worker:
+        started = _spawn.Event()
+        process = _spawn.Process(
+            target=_run_worker,
+            args=(self.app, self.sock, self.host, self.port, started),
+        )
+        process.start()
+        return _Worker(process, started)
+
+    def _wait_started(self, worker: _Worker) -> bool:
+        deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+        while time.monotonic() < deadline and not self._should_exit:
+            if worker.started.wait(TICK_SECONDS):
+                return True
+            if not worker.process.is_alive():
+                return False
+        return False
+
+    def _rolling_restart(self) -> None:
+        """Replace workers one at a time so capacity never drops below ``workers``."""
+        logger.info("Rolling restart")
+        for index, old in enumerate(list(self.processes)):
+            new = self._spawn()
+            if not self._wait_started(new):
+                logger.error("Replacement worker failed to start; keeping the old one")
+                self._stop(new)
+                continue
+            self.processes[index] = new
+            self._stop(old)
+
+    def _replace_dead_workers(self) -> None:
+        for index, worker in enumerate(self.processes):
+            if worker.process.is_alive():
+                continue
+            self._mark_dead(worker)
+            logger.warning(
+                "Worker exited", pid=worker.process.pid, exitcode=worker.process.exitcode
+            )
+            lifetime = time.monotonic() - worker.spawned_at
+            if lifetime < MIN_WORKER_LIFETIME_SECONDS:
+                time.sleep(MIN_WORKER_LIFETIME_SECONDS - lifetime)
+            if not self._should_exit:
+                self.processes[index] = self._spawn()
+
+    @staticmethod
+    def _signal_stop(worker: _Worker) -> None:
+        # uvicorn treats a second SIGTERM as "exit now", so only send one
+        if not worker.stopping and worker.process.is_alive():
+            worker.process.terminate()
+        worker.stopping = True
+
+    def _stop(self, worker: _Worker) -> None:
+        """SIGTERM for a graceful drain, SIGKILL if it outlives the grace period."""
+        self._signal_stop(worker)
+        worker.process.join(settings.WORKER_GRACEFUL_TIMEOUT_SECONDS + 5)
+        if worker.process.is_alive():
+            logger.warning("Worker did not exit in time; killing", pid=worker.process.pid)
+            worker.process.kill()
+            worker.process.join()
+        self._mark_dead(worker)
+
+    def _stop_all(self) -> None:
+        logger.info("Stopping workers")
+        for worker in self.processes:
+            self._signal_stop(worker)
+        for worker in self.processes:
+            self._stop(worker)
+        if self.sock is not None:
+            self.sock.close()
+
+    @staticmethod
+    def _mark_dead(worker: _Worker) -> None:
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR") and worker.process.pid is not None:
+            from prometheus_client import multiprocess
+
+            multiprocess.mark_process_dead(worker.process.pid)
+
+    def _handle_exit(self, _sig: int, _frame: FrameType | None) -> None:
+        self._should_exit = True
+
+    def _handle_reload(self, _sig: int, _frame: FrameType | None) -> None:
+        self._should_reload = True
+
+
+def configure_workers(workers: int) -> None:
+    """Export per-worker settings to the environment inherited by spawned workers."""
+    env: dict[str, Any] = {}
+
+    db_pool, db_overflow = worker_pool_sizes(
+        settings.DB_CONNECTION_BUDGET, workers, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    )
+    redis_pool, _ = worker_pool_sizes(
+        settings.REDIS_CONNECTION_BUDGET, workers, settings.REDIS_POOL_SIZE, 0
+    )
+    for name, budget, size in (
+        ("DB_CONNECTION_BUDGET", settings.DB_CONNECTION_BUDGET, db_pool + db_overflow),
+        ("REDIS_CONNECTION_BUDGET", settings.REDIS_CONNECTION_BUDGET, redis_pool),
+    ):
+        if budget is not None and size * workers > budget:
+            # Pools need at least one connection per worker
+            logger.warning(
+                "Connection budget too small for workers",
+                setting=name,
+                budget=budget,
+                workers=workers,
+                connections=size * workers,
+            )
+    env["DB_POOL_SIZE"] = db_pool
+    env["DB_MAX_OVERFLOW"] = db_overflow
+    env["REDIS_POOL_SIZE"] = redis_pool
+    env["REDIS_POOL_WARM_SIZE"] = min(settings.REDIS_POOL_WARM_SIZE, redis_pool)
+
+    # Metrics must be aggregated across workers to be meaningful
+    if workers > 1 and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        env["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+    os.environ.update({name: str(value) for name, value in env.items()})
+    logger.info("Per-worker pools", workers=workers, **env)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=APP, help="ASGI app import string")
+    parser.add_argument("--workers", type=int, default=settings.WORKERS)
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument(
+        "--reuse-port",
+        action=argparse.BooleanOptionalAction,
+        default=settings.SERVER_REUSE_PORT,
+        help="bind a SO_REUSEPORT socket per worker instead of sharing one",
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    configure_workers(args.workers)
+    Supervisor(args.app, args.workers, args.host, args.port, args.reuse_port).run()
+
+
+if __name__ == "__main__":
+    with contextlib.suppress(KeyboardInterrupt):
+        main(sys.argv[1:])
@@ -1,21 +1,159 @@
-import json
+import asyncio
+import contextlib
+import functools
+import math
+import random
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass
 from typing import Any
 
+from pydantic_core import to_jsonable_python
 from redis.asyncio import ConnectionPool, Redis
+from redis.asyncio.client import PubSub
+from redis.asyncio.lock import Lock
+from redis.exceptions import RedisError
 
+from app.core import json
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import CACHE_REQUESTS, REDIS_COMMAND_SECONDS
+from app.services.local_cache import LocalCache
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional format
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional compression
+    zstandard = None
 
 logger = get_logger(__name__)
 
 redis_client: Redis | None = None
 redis_pool: ConnectionPool | None = None
 
+# Optional per-worker tier in front of Redis
+local_cache: LocalCache | None = None
+_invalidation_task: asyncio.Task[None] | None = None
+
+redis_hits = 0
+redis_misses = 0
+
+_local_hit = CACHE_REQUESTS.labels(tier="local", result="hit")
+_local_miss = CACHE_REQUESTS.labels(tier="local", result="miss")
+_redis_hit = CACHE_REQUESTS.labels(tier="redis", result="hit")
+_redis_miss = CACHE_REQUESTS.labels(tier="redis", result="miss")
+_redis_get_seconds = REDIS_COMMAND_SECONDS.labels(command="get")
+_redis_set_seconds = REDIS_COMMAND_SECONDS.labels(command="set")
+_redis_delete_seconds = REDIS_COMMAND_SECONDS.labels(command="delete")
+_redis_mget_seconds = REDIS_COMMAND_SECONDS.labels(command="mget")
+_redis_pipeline_seconds = REDIS_COMMAND_SECONDS.labels(command="pipeline")
+
+# In-flight loads keyed by cache key, used to coalesce concurrent misses
+_inflight: dict[str, asyncio.Future[Any]] = {}
+
+# Background refreshes started by get_or_compute, one per key
+_refreshing: dict[str, asyncio.Task[Any]] = {}
+
+# Tags this worker's invalidations so it does not evict what it just wrote
+_worker_id = uuid.uuid4().hex
+
+# How often a process waiting on another's recompute re-reads the key
+LOCK_POLL_SECONDS = 0.05
+
+
+@dataclass(frozen=True, slots=True)
+class Codec:
+    """A Redis value format, identified by the header byte of each entry."""
+
+    name: str
+    header: int
+    encode: Callable[[Any], bytes]
+    decode: Callable[[bytes], Any]
+
+
+def _json_encode(value: Any) -> bytes:
+    return json.dumps(value, default=to_jsonable_python)
+
+
+def _msgpack_encode(value: Any) -> bytes:
+    if msgpack is None:
+        raise RuntimeError("CACHE_CODEC=msgpack requires the msgpack package")
+    return msgpack.packb(value, default=to_jsonable_python)
+
+
+def _msgpack_decode(payload: bytes) -> Any:
+    if msgpack is None:
+        raise ValueError("msgpack cache entry but msgpack is not installed")
+    return msgpack.unpackb(payload)
+
+
+# Entries are one header byte (codec, plus ZSTD_FLAG) followed by the payload.
+# Header values sit below the bytes a JSON document can start with, so entries
+# written before headers existed are still read as plain JSON.
+ZSTD_FLAG = 0x10
+CODECS = {
+    codec.name: codec
+    for codec in (
+        Codec("json", 0x01, _json_encode, json.loads),
+        Codec("msgpack", 0x02, _msgpack_encode, _msgpack_decode),
+    )
+}
+_codecs_by_header = {codec.header: codec for codec in CODECS.values()}
+
+_zstd_compressor = zstandard.ZstdCompressor() if zstandard is not None else None
+_zstd_decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+# What decode_value raises for a corrupt or unreadable entry
+_DECODE_ERRORS: tuple[type[Exception], ...] = (
+    (ValueError, zstandard.ZstdError) if zstandard is not None else (ValueError,)
+)
+
+
+def encode_value(value: Any, codec: Codec | None = None) -> bytes:
+    """Serialize a value for Redis with the configured codec.
+
+    Values must be JSON-compatible apart from types pydantic can serialize,
+    such as datetimes; those come back in their JSON form whatever the codec,
+    so entries decode the same after ``CACHE_CODEC`` changes.
+    """
+    codec = codec or CODECS[settings.CACHE_CODEC]
+    header = codec.header
+    payload = codec.encode(value)
+
+    threshold = settings.CACHE_COMPRESSION_MIN_BYTES
+    if _zstd_compressor is not None and threshold is not None and len(payload) >= threshold:
+        header |= ZSTD_FLAG
+        payload = _zstd_compressor.compress(payload)
+    return bytes((header,)) + payload
+
+
+def decode_value(raw: bytes) -> Any:
+    """Deserialize a Redis entry written by any codec, or a headerless JSON one."""
+    header = raw[0]
+    codec = _codecs_by_header.get(header & ~ZSTD_FLAG)
+    if codec is None:
+        return json.loads(raw)
+
+    payload = raw[1:]
+    if header & ZSTD_FLAG:
+        if _zstd_decompressor is None:
+            raise ValueError("zstd-compressed cache entry but zstandard is not installed")
+        payload = _zstd_decompressor.decompress(payload)
+    return codec.decode(payload)
+
 
 async def init_cache() -> None:
     """Initialize Redis connection pool."""
     global redis_client, redis_pool
 
+    if settings.CACHE_CODEC == "msgpack" and msgpack is None:
+        raise RuntimeError("CACHE_CODEC=msgpack requires the msgpack package")
+
     logger.info("Initializing Redis pool", url=str(settings.REDIS_URL))
 
     redis_pool = ConnectionPool.from_url(
@@ -26,18 +164,97 @@ async def init_cache() -> None:
 
     redis_client = Redis(connection_pool=redis_pool)
 
-    # Test connection
     try:
-        redis_client.ping()
-    except Exception as e:
-        raise RuntimeError(f"Redis ping failed: {e}") from e
+        await redis_client.ping()
+        if settings.REDIS_POOL_WARM_SIZE:
+            await warm_cache_pool(settings.REDIS_POOL_WARM_SIZE)
+    except (RedisError, OSError) as e:
+        # Start anyway: cache calls fail open and /ready reports Redis until it is back
+        logger.warning("Redis unreachable at startup", error=str(e))
+    else:
+        logger.info("Redis pool initialized")
 
-    logger.info("Redis pool initialized")
+    if settings.CACHE_L1_ENABLED:
+        init_local_cache()
+
+
+async def warm_cache_pool(size: int) -> None:
+    """Open up to ``size`` Redis connections now instead of on first use."""
+    if redis_pool is None:
+        return
+
+    size = min(size, settings.REDIS_POOL_SIZE)
+    conns = [await redis_pool.get_connection() for _ in range(size)]
+    for conn in conns:
+        await redis_pool.release(conn)
+
+    logger.info("Redis pool warmed", connections=size)
+
+
+def init_local_cache() -> None:
+    """Enable the in-process tier and subscribe to cross-worker invalidations."""
+    global local_cache, _invalidation_task
+
+    local_cache = LocalCache(
+        max_entries=settings.CACHE_L1_MAX_ENTRIES,
+        max_bytes=settings.CACHE_L1_MAX_BYTES,
+        ttl=settings.CACHE_L1_TTL_SECONDS,
+    )
+
+    if redis_client is not None:
+        _invalidation_task = asyncio.create_task(_listen_for_invalidations(redis_client))
+
+    logger.info(
+        "Local cache enabled",
+        max_entries=settings.CACHE_L1_MAX_ENTRIES,
+        max_bytes=settings.CACHE_L1_MAX_BYTES,
+    )
+
+
+def _invalidation(key: str) -> str:
+    return f"{_worker_id} {key}"
+
+
+async def _listen_for_invalidations(client: Redis) -> None:
+    """Evict keys written or deleted by other workers from the local tier.
+
+    Messages are ``"<worker id> <key>"``.
+    """
+    while True:
+        pubsub: PubSub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                if local_cache is None or message["type"] != "message":
+                    continue
+                sender, _, key = message["data"].decode().partition(" ")
+                if sender != _worker_id:
+                    local_cache.delete(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Drop the whole tier: invalidations may have been missed meanwhile
+            logger.warning("Cache invalidation listener failed", error=str(e))
+            if local_cache is not None:
+                local_cache.clear()
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
 
 
 async def close_cache() -> None:
     """Close Redis connection pool."""
-    global redis_client, redis_pool
+    global redis_client, redis_pool, local_cache, _invalidation_task
+
+    if _invalidation_task is not None:
+        _invalidation_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _invalidation_task
+        _invalidation_task = None
+    local_cache = None
+
+    for task in list(_refreshing.values()):
+        task.cancel()
 
     if redis_client:
         logger.info("Closing Redis pool")
@@ -50,27 +267,369 @@ async def close_cache() -> None:
 
 
 async def get_cache(key: str) -> Any | None:
-    """Get value from cache."""
+    """Get value from cache.
+
+    Values served from the local tier are shared, so treat them as read-only.
+    """
+    global redis_misses
+
+    if local_cache is not None:
+        value = local_cache.get(key)
+        if value is not None:
+            _local_hit.inc()
+            return value
+        _local_miss.inc()
+
     if redis_client is None:
         return None
 
-    value = await redis_client.get(key)
-    if value:
-        return json.loads(value)
-    return None
+    start = time.perf_counter()
+    try:
+        raw = await redis_client.get(key)
+    except RedisError as e:
+        # Fail open: callers load from the database as on a miss
+        logger.warning("Cache unavailable", operation="get", error=str(e))
+        raw = None
+    _redis_get_seconds.observe(time.perf_counter() - start)
+    if not raw:
+        redis_misses += 1
+        _redis_miss.inc()
+        return None
+
+    return await _decode_hit(key, raw)
+
+
+async def _decode_hit(key: str, raw: bytes | str) -> Any | None:
+    """Decode a Redis hit and copy it to the local tier.
+
+    Unreadable entries count as misses and are deleted so the next load
+    replaces them.
+    """
+    global redis_hits, redis_misses
+
+    # redis-py types replies as bytes or str; only decode_responses=True clients return str
+    if isinstance(raw, str):
+        raw = raw.encode()
+    try:
+        value = decode_value(raw)
+    except _DECODE_ERRORS as e:
+        logger.warning("Unreadable cache entry", key=key, error=str(e))
+        redis_misses += 1
+        _redis_miss.inc()
+        if redis_client is not None:
+            with contextlib.suppress(RedisError):
+                await redis_client.delete(key)
+        return None
+
+    redis_hits += 1
+    _redis_hit.inc()
+    if local_cache is not None:
+        local_cache.set(key, value, len(raw))
+    return value
+
+
+async def get_many(keys: Iterable[str]) -> list[Any | None]:
+    """Look up several keys, fetching local-tier misses with a single MGET.
+
+    Returns values in key order, with None for misses.
+    """
+    global redis_misses
+
+    keys = list(keys)
+    values: list[Any | None] = [None] * len(keys)
+    remote: list[int] = []
+    for index, key in enumerate(keys):
+        if local_cache is not None:
+            value = local_cache.get(key)
+            if value is not None:
+                _local_hit.inc()
+                values[index] = value
+                continue
+            _local_miss.inc()
+        remote.append(index)
+
+    if not remote or redis_client is None:
+        return values
+
+    start = time.perf_counter()
+    try:
+        raws = await redis_client.mget([keys[index] for index in remote])
+    except RedisError as e:
+        logger.warning("Cache unavailable", operation="mget", error=str(e))
+        raws = [None] * len(remote)
+    _redis_mget_seconds.observe(time.perf_counter() - start)
+    for index, raw in zip(remote, raws, strict=True):
+        if raw:
+            values[index] = await _decode_hit(keys[index], raw)
+        else:
+            redis_misses += 1
+            _redis_miss.inc()
+    return values
 
 
 async def set_cache(key: str, value: Any, ttl: int = 300) -> None:
-    """Set value in cache with TTL."""
+    """Set value in cache with TTL, evicting older copies from other workers' local tiers."""
     if redis_client is None:
         return
 
-    await redis_client.setex(key, ttl, json.dumps(value))
+    raw = encode_value(value)
+    start = time.perf_counter()
+    try:
+        if settings.CACHE_L1_ENABLED:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(key, raw, ex=ttl)
+                pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, _invalidation(key))
+                await pipe.execute()
+        else:
+            await redis_client.set(key, raw, ex=ttl)
+    except RedisError as e:
+        logger.warning("Cache unavailable", operation="set", error=str(e))
+        return
+    _redis_set_seconds.observe(time.perf_counter() - start)
+    if local_cache is not None:
+        local_cache.set(key, value, len(raw), ttl)
+
+
+async def set_many(values: Mapping[str, Any], ttl: int = 300) -> None:
+    """Set several values with one TTL in a single pipelined round trip."""
+    if redis_client is None or not values:
+        return
+
+    encoded = {key: encode_value(value) for key, value in values.items()}
+    start = time.perf_counter()
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, raw in encoded.items():
+                pipe.set(key, raw, ex=ttl)
+                if settings.CACHE_L1_ENABLED:
+                    pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, _invalidation(key))
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning("Cache unavailable", operation="set_many", error=str(e))
+        return
+    _redis_pipeline_seconds.observe(time.perf_counter() - start)
+    if local_cache is not None:
+        for key, raw in encoded.items():
+            local_cache.set(key, values[key], len(raw), ttl)
 
 
 async def delete_cache(key: str) -> None:
-    """Delete value from cache."""
+    """Delete value from cache and evict it from every worker's local tier."""
+    if local_cache is not None:
+        local_cache.delete(key)
+
     if redis_client is None:
         return
 
-    await redis_client.delete(key)
+    start = time.perf_counter()
+    try:
+        await redis_client.delete(key)
+        _redis_delete_seconds.observe(time.perf_counter() - start)
+        if settings.CACHE_L1_ENABLED:
+            await redis_client.publish(settings.CACHE_INVALIDATION_CHANNEL, _invalidation(key))
+    except RedisError as e:
+        # The entry then lives until its TTL, as after a failed write
+        logger.warning("Cache unavailable", operation="delete", error=str(e))
+
+
+def get_cache_stats() -> dict[str, dict[str, int]]:
+    """Hit/miss/eviction counters for each cache tier in this worker."""
+    stats = {"redis": {"hits": redis_hits, "misses": redis_misses}}
+    if local_cache is not None:
+        stats["local"] = local_cache.stats()
+    return stats
+
+
+async def get_or_load(
+    key: str,
+    loader: Callable[[], Awaitable[Any | None]],
+    ttl: int = settings.CACHE_TTL_SECONDS,
+) -> Any | None:
+    """Read-through lookup with single-flight coalescing of concurrent misses.
+
+    On a miss only the first caller runs ``loader``; concurrent callers for the
+    same key await its result instead of issuing their own query. ``None``
+    results are returned but not cached.
+    """
+    value = await get_cache(key)
+    if value is not None:
+        return value
+
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_load_and_store(key, loader, ttl))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # Shield so a cancelled waiter does not cancel the load for everyone else
+    return await asyncio.shield(future)
+
+
+async def _load_and_store(
+    key: str,
+    loader: Callable[[], Awaitable[Any | None]],
+    ttl: int,
+) -> Any | None:
+    """Run ``loader`` and populate the cache with its result."""
+    value = await loader()
+    if value is not None:
+        await set_cache(key, value, ttl)
+    return value
+
+
+async def get_or_compute[T](
+    key: str,
+    compute: Callable[[], Awaitable[T]],
+    ttl: int = settings.CACHE_TTL_SECONDS,
+    stale_ttl: int = settings.CACHE_STALE_TTL_SECONDS,
+) -> T:
+    """Read-through lookup that never lets a popular key expire under load.
+
+    Entries record when they expire and how long ``compute`` took. Each read
+    may refresh a value early with probability rising towards expiry (XFetch),
+    and expired values are served for up to ``stale_ttl`` more seconds; either
+    way the caller gets the cached value at once while a background task
+    recomputes it. A short Redis lock lets only one process recompute a key;
+    on a cold miss, other processes wait for its result instead of querying.
+
+    ``compute`` may outlive the request that triggered it, so it must not use
+    request-scoped resources such as the request's DB session. Values are
+    stored with the cache codec and ``None`` results are not cached. Keys are
+    only meant for this function, not for ``get_cache``/``set_cache``.
+    """
+    entry = await get_cache(key)
+    if entry is not None:
+        value, delta, expires_at = entry
+        # XFetch: -log(U) is exponentially distributed, so slow computations
+        # and reads close to expiry are more likely to trigger a refresh
+        early = delta * settings.CACHE_XFETCH_BETA * -math.log(1.0 - random.random())
+        if time.time() + early >= expires_at and key not in _refreshing:
+            task = asyncio.create_task(_refresh(key, compute, ttl, stale_ttl))
+            _refreshing[key] = task
+            task.add_done_callback(lambda _: _refreshing.pop(key, None))
+        return value
+
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_compute_locked(key, compute, ttl, stale_ttl))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # Shield so a cancelled waiter does not cancel the computation for everyone else
+    return await asyncio.shield(future)
+
+
+def cached[**P, T](
+    key: Callable[P, str],
+    ttl: int = settings.CACHE_TTL_SECONDS,
+    stale_ttl: int = settings.CACHE_STALE_TTL_SECONDS,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """Decorate an async helper to go through ``get_or_compute``.
+
+    ``key`` receives the helper's arguments and returns its cache key, e.g.
+    ``@cached(lambda owner_id: f"owner-stats:{owner_id}")``.
+    """
+
+    def decorator(fn: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            return await get_or_compute(
+                key(*args, **kwargs), lambda: fn(*args, **kwargs), ttl, stale_ttl
+            )
+
+        return wrapper
+
+    return decorator
+
+
+async def _compute_and_store[T](
+    key: str, compute: Callable[[], Awaitable[T]], ttl: int, stale_ttl: int
+) -> T:
+    """Run ``compute`` and store its result with the metadata XFetch needs."""
+    start = time.perf_counter()
+    value = await compute()
+    delta = time.perf_counter() - start
+    if value is not None:
+        await set_cache(key, [value, delta, time.time() + ttl], ttl + stale_ttl)
+    return value
+
+
+def _lock(key: str) -> Lock:
+    assert redis_client is not None
+    return redis_client.lock(
+        f"lock:{key}", timeout=settings.CACHE_LOCK_TIMEOUT_SECONDS, blocking=False
+    )
+
+
+async def _acquire(lock: Lock) -> bool | None:
+    """Try to take ``lock``; None if Redis could not be reached."""
+    try:
+        return await lock.acquire()
+    except RedisError as e:
+        logger.warning("Cache unavailable", operation="lock", error=str(e))
+        return None
+
+
+async def _release(lock: Lock) -> None:
+    # The lock may already have expired if the computation overran it, and
+    # Redis may have gone away since; either way it expires by itself
+    with contextlib.suppress(RedisError):
+        await lock.release()
+
+
+async def _compute_locked[T](
+    key: str, compute: Callable[[], Awaitable[T]], ttl: int, stale_ttl: int
+) -> T:
+    """Compute a missing key, or wait for the process already computing it."""
+    if redis_client is None:
+        return await compute()
+
+    lock = _lock(key)
+    acquired = await _acquire(lock)
+    if acquired is None:
+        # Nobody can publish a result to wait for while Redis is unreachable
+        return await compute()
+    if acquired:
+        try:
+            return await _compute_and_store(key, compute, ttl, stale_ttl)
+        finally:
+            await _release(lock)
+
+    deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        await asyncio.sleep(LOCK_POLL_SECONDS)
+        entry = await get_cache(key)
+        if entry is not None:
+            return entry[0]
+
+    # The lock holder died or gave up; compute without it
+    return await _compute_and_store(key, compute, ttl, stale_ttl)
+
+
+async def _refresh(
+    key: str, compute: Callable[[], Awaitable[Any]], ttl: int, stale_ttl: int
+) -> None:
+    """Recompute a key in the background unless another process already is."""
+    if redis_client is None:
+        return
+
+    lock = _lock(key)
+    # Unreachable Redis could not store the result either; keep serving stale
+    if not await _acquire(lock):
+        return
+    try:
+        await _compute_and_store(key, compute, ttl, stale_ttl)
+    except Exception as e:  # the stale value keeps being served meanwhile
+        logger.error("Cache refresh failed", key=key, error=str(e))
+    finally:
+        await _release(lock)
+
+
+def item_cache_key(item_id: int) -> str:
+    """Cache key for a serialized item."""
+    return f"item:{item_id}"
+
+
+def user_cache_key(user_id: int) -> str:
+    """Cache key for a serialized user."""
+    return f"user:{user_id}"
@@ -0,0 +1,43 @@
+"""Compare rows/sec of POST /items against POST /items:batch.
+
+Usage: uv run python -m benchmarks.bulk_insert [rows]
+"""
+
+import asyncio
+import sys
+import time
+
+from benchmarks.common import bench_client
+
+BATCH_SIZE = 1000
+
+
+def _rows(count: int, prefix: str) -> list[dict[str, str]]:
+    return [{"name": f"{prefix} {i}", "description": "benchmark"} for i in range(count)]
+
+
+async def main(count: int) -> None:
+    async with bench_client() as client:
+        start = time.perf_counter()
+        for row in _rows(count, "single"):
+            response = await client.post("/api/v1/items", json=row)
+            response.raise_for_status()
+        single = count / (time.perf_counter() - start)
+
+        rows = _rows(count, "batch")
+        start = time.perf_counter()
+        for offset in range(0, count, BATCH_SIZE):
+            response = await client.post(
+                "/api/v1/items:batch", json=rows[offset : offset + BATCH_SIZE]
+            )
+            response.raise_for_status()
+        batch = count / (time.perf_counter() - start)
+
+    print(f"{'path':<20}{'rows/sec':>12}")
+    print(f"{'POST /items':<20}{single:>12.0f}")
+    print(f"{'POST /items:batch':<20}{batch:>12.0f}")
+    print(f"speedup: {batch / single:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,62 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks drive the real application in-process through httpx's ASGI
+transport. They use a throwaway SQLite database unless ``BENCH_DATABASE_URL``
+points at something closer to production, e.g. a local Postgres.
+"""
+
+import logging
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+os.environ.setdefault("OTEL_ENABLED", "false")
+
+import structlog
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.db import session
+from app.db.base import Base
+from app.main import app
+
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL", "sqlite+aiosqlite:///./bench.db")
+
+
+@asynccontextmanager
+async def bench_engine() -> AsyncIterator[AsyncEngine]:
+    """Point the application's DB layer at a freshly created benchmark schema."""
+    # Request logs would dominate the measurements
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    engine = create_async_engine(BENCH_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    session.engine = engine
+    session.async_session_maker = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    session.primary_read_session_maker = async_sessionmaker(
+        engine, class_=session.ReadSession, expire_on_commit=False
+    )
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+@asynccontextmanager
+async def bench_client() -> AsyncIterator[AsyncClient]:
+    """HTTP client bound to the in-process application and benchmark database."""
+    async with (
+        bench_engine(),
+        AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client,
+    ):
+        yield client
@@ -0,0 +1,102 @@
+"""CPU per request and bytes saved by each response compression setup.
+
+Serves a 100- and a 1000-row item page with a fixed ETag (as a cached page
+would have) through Starlette's GZipMiddleware, which the app used before,
+and through CompressionMiddleware with each installed encoder, with and
+without reuse of compressed bodies. CPU time is process time per request,
+including the app and the in-process client, so compare rows with the
+``none`` baseline.
+
+Usage: uv run python -m benchmarks.compression [requests]
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import Callable
+
+from fastapi import FastAPI, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from httpx import ASGITransport, AsyncClient
+
+from app.core.compression import CompressionMiddleware, build_encoders
+from app.core.json import dumps
+from app.services.local_cache import LocalCache
+
+SIZES = (100, 1000)
+
+
+def page(size: int) -> bytes:
+    return dumps(
+        [
+            {
+                "id": i,
+                "name": f"Item {i}",
+                "description": f"Benchmark item number {i}",
+                "owner_id": i % 7 + 1,
+                "created_at": "2026-01-01T12:00:00.123456Z",
+                "updated_at": "2026-01-02T08:30:00.654321Z",
+            }
+            for i in range(size)
+        ]
+    )
+
+
+def make_app(bodies: dict[int, bytes], add_middleware: Callable[[FastAPI], None]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{size}")
+    async def items(size: int) -> Response:
+        return Response(bodies[size], media_type="application/json", headers={"ETag": 'W/"1"'})
+
+    add_middleware(app)
+    return app
+
+
+def setups() -> dict[str, tuple[str, Callable[[FastAPI], None]]]:
+    """Name -> (Accept-Encoding, middleware installer)."""
+    configs: dict[str, tuple[str, Callable[[FastAPI], None]]] = {
+        "none": ("identity", lambda _app: None),
+        "starlette gzip": (
+            "gzip",
+            lambda app: app.add_middleware(GZipMiddleware, minimum_size=1000),
+        ),
+    }
+    for encoder in build_encoders(["zstd", "br", "gzip"]):
+        for reuse in (False, True):
+
+            def install(app: FastAPI, encoder=encoder, reuse=reuse) -> None:
+                cache = LocalCache(1000, 16 * 1024 * 1024, 300) if reuse else None
+                app.add_middleware(CompressionMiddleware, encoders=[encoder], cache=cache)
+
+            configs[f"{encoder.name}{' reused' if reuse else ''}"] = (encoder.name, install)
+    return configs
+
+
+async def measure(app: FastAPI, path: str, accept: str, count: int) -> tuple[float, int]:
+    """(CPU µs per request, response bytes)."""
+    headers = {"Accept-Encoding": accept}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for _ in range(20):
+            response = await client.get(path, headers=headers)
+        start = time.process_time()
+        for _ in range(count):
+            await client.get(path, headers=headers)
+        cpu = time.process_time() - start
+    return cpu / count * 1e6, response.num_bytes_downloaded
+
+
+async def main(count: int) -> None:
+    bodies = {size: page(size) for size in SIZES}
+
+    print(f"{'setup':<16}{'rows':>6}{'CPU µs/req':>12}{'bytes':>10}{'saved':>8}")
+    for name, (accept, install) in setups().items():
+        app = make_app(bodies, install)
+        for size in SIZES:
+            cpu, sent = await measure(app, f"/items/{size}", accept, count)
+            saved = 1 - sent / len(bodies[size])
+            print(f"{name:<16}{size:>6}{cpu:>12.0f}{sent:>10}{saved:>8.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,87 @@
+"""Requests/sec through the legacy BaseHTTPMiddleware logger vs the ASGI one.
+
+Both apps serve ``/health`` and a 100-row JSON list, driven in-process over
+httpx's ASGI transport, so the difference is middleware overhead only.
+
+Usage: uv run python -m benchmarks.middleware [requests]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from collections.abc import Awaitable, Callable
+
+import structlog
+from fastapi import FastAPI, Request, Response
+from httpx import ASGITransport, AsyncClient
+
+from app.core.logging import get_logger
+from app.core.middleware import RequestLoggingMiddleware
+
+logger = get_logger(__name__)
+
+ROWS: list[dict[str, object]] = [{"id": i, "name": f"Item {i}", "owner_id": 1} for i in range(100)]
+
+
+async def legacy_logging_middleware(
+    request: Request,
+    call_next: Callable[[Request], Awaitable[Response]],
+) -> Response:
+    """The previous BaseHTTPMiddleware-based implementation."""
+    start_time = time.time()
+    response = await call_next(request)
+    process_time = time.time() - start_time
+    logger.info(
+        "request_completed",
+        method=request.method,
+        path=request.url.path,
+        status_code=response.status_code,
+        duration_ms=round(process_time * 1000, 2),
+    )
+    response.headers["X-Process-Time"] = str(process_time)
+    return response
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health() -> dict[str, str]:
+        return {"status": "healthy"}
+
+    @app.get("/items")
+    async def items() -> list[dict[str, object]]:
+        return ROWS
+
+    return app
+
+
+async def rps(app: FastAPI, path: str, count: int) -> float:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for _ in range(100):
+            await client.get(path)
+        start = time.perf_counter()
+        for _ in range(count):
+            await client.get(path)
+        return count / (time.perf_counter() - start)
+
+
+async def main(count: int) -> None:
+    # Measure middleware cost, not stdout
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    legacy = make_app()
+    legacy.middleware("http")(legacy_logging_middleware)
+    asgi = make_app()
+    asgi.add_middleware(RequestLoggingMiddleware)
+
+    print(f"{'path':<10}{'legacy rps':>12}{'asgi rps':>12}{'gain':>8}")
+    for path in ("/health", "/items"):
+        before = await rps(legacy, path, count)
+        after = await rps(asgi, path, count)
+        print(f"{path:<10}{before:>12.0f}{after:>12.0f}{after / before - 1:>8.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -0,0 +1,142 @@
+"""Python overhead per query: statements built per request vs pre-built ones.
+
+Runs each hot query on one connection in four ways:
+
+- ``driver``: the final SQL and parameters sent straight to the driver
+- ``prebuilt``: the statement from ``app.db.queries`` with bound parameters
+- ``built``: a fresh ``Select`` per call, as handlers used to build them
+- ``uncached``: the same on an engine with ``query_cache_size=0``, compiling every time
+
+Overhead is time per query above ``driver``, i.e. spent in SQLAlchemy.
+
+Usage: uv run python -m benchmarks.queries [repeats]
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import Select, event, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from app.db import queries
+from app.db.columns import ITEM_COLUMNS, USER_COLUMNS
+from app.models.item import Item
+from app.models.user import User
+from benchmarks.common import BENCH_DATABASE_URL, bench_engine
+
+IDS = [3, 1, 2]
+AFTER = datetime(2020, 1, 1, tzinfo=UTC)
+
+# Name -> (statement built per call, pre-built statement factory, its parameters)
+type Case = tuple[
+    Callable[[], Select[*tuple[Any, ...]]],
+    Callable[[str], Select[*tuple[Any, ...]]],
+    dict[str, Any],
+]
+
+CASES: dict[str, Case] = {
+    "items by id": (
+        lambda: select(*ITEM_COLUMNS).where(Item.id.in_(IDS)),
+        queries.items_by_id,
+        {"ids": IDS},
+    ),
+    "item page": (
+        lambda: select(*ITEM_COLUMNS).order_by(Item.id).limit(100),
+        lambda _dialect: queries.item_page("id", owner=False, keyset=False, offset=False),
+        {"limit": 100},
+    ),
+    "owner keyset page": (
+        lambda: (
+            select(*ITEM_COLUMNS)
+            .where(Item.owner_id == 1)
+            .order_by(Item.created_at, Item.id)
+            .limit(100)
+            .where(
+                tuple_(Item.created_at, Item.id)
+                > tuple_(literal(AFTER, Item.created_at.type), literal(0, Item.id.type))
+            )
+        ),
+        lambda _dialect: queries.item_page("created_at", owner=True, keyset=True, offset=False),
+        {"limit": 100, "owner_id": 1, "after_created_at": AFTER, "after_id": 0},
+    ),
+    "user page": (
+        lambda: select(*USER_COLUMNS).order_by(User.id).limit(100),
+        lambda _dialect: queries.user_page("id", keyset=False, offset=False),
+        {"limit": 100},
+    ),
+}
+
+
+async def per_call_us(fn: Callable[[], Awaitable[Any]], repeats: int) -> float:
+    for _ in range(20):
+        await fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        await fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+async def sent_to_driver(
+    conn: AsyncConnection, stmt: Select[*tuple[Any, ...]], params: dict[str, Any]
+) -> tuple[str, Any]:
+    """The SQL and parameters that executing ``stmt`` passes to the driver."""
+    sent: list[tuple[str, Any]] = []
+
+    def record(_conn: Any, _cursor: Any, statement: str, parameters: Any, *_: Any) -> None:
+        sent.append((statement, parameters))
+
+    event.listen(conn.sync_engine, "before_cursor_execute", record)
+    try:
+        await conn.execute(stmt, params)
+    finally:
+        event.remove(conn.sync_engine, "before_cursor_execute", record)
+    return sent[0]
+
+
+async def bench_case(
+    conn: AsyncConnection, uncached: AsyncConnection, case: Case, repeats: int
+) -> tuple[float, float, float, float]:
+    """(driver, prebuilt, built, uncached) µs per query."""
+    build, prebuilt, params = case
+    stmt = prebuilt(conn.dialect.name)
+    sql, parameters = await sent_to_driver(conn, stmt, params)
+    return (
+        await per_call_us(lambda: conn.exec_driver_sql(sql, parameters), repeats),
+        await per_call_us(lambda: conn.execute(stmt, params), repeats),
+        await per_call_us(lambda: conn.execute(build()), repeats),
+        await per_call_us(lambda: uncached.execute(build()), repeats),
+    )
+
+
+async def seed(db: AsyncSession, count: int) -> None:
+    db.add_all(Item(name=f"Item {i}", description="benchmark", owner_id=1) for i in range(count))
+    db.add_all(User(email=f"user{i}@example.com", username=f"user{i}") for i in range(count))
+    await db.commit()
+
+
+async def main(repeats: int) -> None:
+    uncached_engine = create_async_engine(BENCH_DATABASE_URL, query_cache_size=0)
+    async with bench_engine() as engine:
+        async with AsyncSession(engine) as db:
+            await seed(db, 100)
+
+        print(
+            f"{'query':<19}{'driver µs':>11}{'prebuilt µs':>13}{'built µs':>10}"
+            f"{'uncached µs':>13}{'overhead saved':>16}"
+        )
+        async with engine.connect() as conn, uncached_engine.connect() as uncached:
+            for name, case in CASES.items():
+                driver, fast, slow, cold = await bench_case(conn, uncached, case, repeats)
+                print(
+                    f"{name:<19}{driver:>11.0f}{fast:>13.0f}{slow:>10.0f}{cold:>13.0f}"
+                    f"{1 - (fast - driver) / (slow - driver):>16.0%}"
+                )
+    await uncached_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
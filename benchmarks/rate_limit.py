@@ -0,0 +1,82 @@
+"""Per-request overhead of RateLimitMiddleware on allowed requests.
+
+Calls the middleware directly around a no-op ASGI app, so the numbers are
+the limiter's own cost. Redis is an in-process fake unless ``BENCH_REDIS_URL``
+is set, which makes the (rare) reservation round trips unrealistically cheap.
+
+Usage: uv run python -m benchmarks.rate_limit [requests]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import fakeredis
+from redis.asyncio import Redis
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.rate_limit import RateLimitMiddleware
+from app.services import cache
+
+SCOPE: Scope = {
+    "type": "http",
+    "path": "/api/v1/items",
+    "headers": [],
+    "client": ("10.0.0.1", 1234),
+}
+
+
+async def noop_app(_scope: Scope, _receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive() -> Message:
+    return {"type": "http.request"}
+
+
+async def send(_message: Message) -> None:
+    return None
+
+
+def percentile(samples: list[int], pct: float) -> float:
+    return statistics.quantiles(samples, n=1000)[int(pct * 10) - 1] / 1000
+
+
+async def measure(app: ASGIApp, count: int) -> list[int]:
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter_ns()
+        await app(SCOPE, receive, send)
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+async def main(count: int) -> None:
+    url = os.getenv("BENCH_REDIS_URL")
+    cache.redis_client = Redis.from_url(url) if url else fakeredis.FakeAsyncRedis()
+    await cache.redis_client.flushdb()
+
+    # High enough that no request is rejected during the run
+    settings.RATE_LIMIT_PER_MINUTE = count * 10
+    settings.RATE_LIMIT_LOCAL_BATCH = 1000
+    limited = RateLimitMiddleware(noop_app)
+
+    await measure(noop_app, 1000)
+    await measure(limited, 1000)
+    baseline = await measure(noop_app, count)
+    samples = await measure(limited, count)
+
+    print(f"{'':<12}{'p50 µs':>10}{'p99 µs':>10}{'p99.9 µs':>10}")
+    for name, data in (("no limiter", baseline), ("limiter", samples)):
+        p50, p99, p999 = (percentile(data, p) for p in (50, 99, 99.9))
+        print(f"{name:<12}{p50:>10.1f}{p99:>10.1f}{p999:>10.1f}")
+    overhead = percentile(samples, 99) - percentile(baseline, 99)
+    print(f"p99 overhead: {overhead:.1f} µs")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
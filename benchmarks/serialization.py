@@ -0,0 +1,83 @@
+"""Serialization cost per response: ORM objects through response_model vs RowSerializer.
+
+Rows are loaded once from the benchmark database; only serialization is timed.
+The legacy path mirrors what FastAPI does for ``response_model=list[...]`` with
+``from_attributes``: validate each object, dump to JSON-compatible Python and
+encode with the stdlib ``json`` module.
+
+Usage: uv run python -m benchmarks.serialization [repeats]
+"""
+
+import asyncio
+import json
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.serialization import ITEM_ROWS, USER_ROWS, RowSerializer
+from app.models.item import Item
+from app.models.user import User
+from benchmarks.common import bench_engine
+
+SIZES = (1, 100, 1000)
+
+
+def legacy(schema: type[Any]) -> Callable[[list[Any]], bytes]:
+    adapter = TypeAdapter(list[schema])
+
+    def serialize(objects: list[Any]) -> bytes:
+        validated = adapter.validate_python(objects, from_attributes=True)
+        content = adapter.dump_python(validated, mode="json")
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+    return serialize
+
+
+def per_call_us(fn: Callable[[], bytes], repeats: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+async def seed(db: AsyncSession, count: int) -> None:
+    db.add_all(Item(name=f"Item {i}", description="benchmark", owner_id=1) for i in range(count))
+    db.add_all(
+        User(email=f"user{i}@example.com", username=f"user{i}", full_name="Bench User")
+        for i in range(count)
+    )
+    await db.commit()
+
+
+async def main(repeats: int) -> None:
+    async with bench_engine() as engine, AsyncSession(engine, expire_on_commit=False) as db:
+        await seed(db, max(SIZES))
+
+        print(f"{'schema':<14}{'rows':>6}{'legacy µs':>12}{'rows µs':>12}{'speedup':>9}")
+        for model, rows in ((Item, ITEM_ROWS), (User, USER_ROWS)):
+            await bench_model(db, model, rows, repeats)
+
+
+async def bench_model(db: AsyncSession, model: Any, rows: RowSerializer[Any], repeats: int) -> None:
+    serialize = legacy(rows.schema)
+    for size in SIZES:
+        objects = list((await db.scalars(select(model).order_by(model.id).limit(size))).all())
+        tuples = (await db.execute(rows.select().order_by(model.id).limit(size))).all()
+        assert json.loads(serialize(objects)) == json.loads(rows.to_json_list(tuples))
+
+        before = per_call_us(lambda objects=objects: serialize(objects), repeats)
+        after = per_call_us(lambda tuples=tuples: rows.to_json_list(tuples), repeats)
+        print(
+            f"{rows.schema.__name__:<14}{size:>6}{before:>12.1f}{after:>12.1f}"
+            f"{before / after:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
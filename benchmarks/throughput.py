@@ -0,0 +1,113 @@
+"""Requests/sec per server for ``python -m app.serve`` at different worker counts.
+
+Starts the real server on a local port for each worker count and drives it
+from several client processes over keep-alive connections. The application
+lifespan runs, so Postgres and Redis must be reachable (``make docker-up``);
+``/health`` itself touches neither, so the numbers are the serving ceiling.
+
+Usage: uv run python -m benchmarks.throughput [--workers 1 4] [--seconds 10] [--path /health]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import httpx
+
+PORT = 18000
+
+
+def _client(
+    url: str, seconds: float, concurrency: int, results: "multiprocessing.Queue[int]"
+) -> None:
+    async def run() -> int:
+        done = 0
+        deadline = time.perf_counter() + seconds
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(limits=limits) as client:
+
+            async def loop() -> None:
+                nonlocal done
+                while time.perf_counter() < deadline:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    done += 1
+
+            await asyncio.gather(*(loop() for _ in range(concurrency)))
+        return done
+
+    results.put(asyncio.run(run()))
+
+
+def wait_until_up(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url).status_code < 500:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server at {url} did not come up")
+
+
+def measure(app: str, workers: int, path: str, seconds: float, clients: int) -> float:
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "app.serve",
+            "--app",
+            app,
+            "--workers",
+            str(workers),
+            "--port",
+            str(PORT),
+        ],
+        env={**os.environ, "LOG_SUCCESS_SAMPLE_RATE": "0", "OTEL_ENABLED": "false"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{PORT}{path}"
+    try:
+        wait_until_up(url)
+        results: multiprocessing.Queue[int] = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=_client, args=(url, seconds, 32, results))
+            for _ in range(clients)
+        ]
+        for proc in procs:
+            proc.start()
+        total = sum(results.get() for _ in procs)
+        for proc in procs:
+            proc.join()
+        return total / seconds
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(60)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app", default="app.main:app")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--clients", type=int, default=max(2, (os.cpu_count() or 2) // 2))
+    args = parser.parse_args()
+
+    print(f"{'workers':<10}{'rps':>10}{'vs 1':>10}")
+    baseline = None
+    for workers in args.workers:
+        result = measure(args.app, workers, args.path, args.seconds, args.clients)
+        baseline = baseline or result
+        print(f"{workers:<10}{result:>10.0f}{result / baseline:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
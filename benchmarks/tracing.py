@@ -0,0 +1,82 @@
+"""Requests/sec with tracing off, head+tail sampled, and recording every span.
+
+Spans go to an in-memory exporter behind the real ``BatchSpanProcessor``
+settings, so the numbers are the in-process cost of creating, sampling and
+batching spans, without network export.
+
+Usage: uv run python -m benchmarks.tracing [requests]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+
+import structlog
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from app.core.config import settings
+from app.core.telemetry import create_tracer_provider
+
+ROWS: list[dict[str, object]] = [{"id": i, "name": f"Item {i}", "owner_id": 1} for i in range(100)]
+
+MODES: dict[str, dict[str, object] | None] = {
+    "off": None,
+    "sampled": {
+        "OTEL_TRACES_SAMPLER": "parentbased_traceidratio",
+        "OTEL_TRACES_SAMPLER_ARG": 0.1,
+        "OTEL_TAIL_SAMPLING_ENABLED": True,
+    },
+    "full": {
+        "OTEL_TRACES_SAMPLER": "always_on",
+        "OTEL_TRACES_SAMPLER_ARG": 1.0,
+        "OTEL_TAIL_SAMPLING_ENABLED": False,
+    },
+}
+
+
+def make_app(mode: dict[str, object] | None) -> tuple[FastAPI, InMemorySpanExporter]:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items() -> list[dict[str, object]]:
+        return ROWS
+
+    exporter = InMemorySpanExporter()
+    if mode is not None:
+        for name, value in mode.items():
+            setattr(settings, name, value)
+        provider = create_tracer_provider(exporter)
+        FastAPIInstrumentor.instrument_app(
+            app, tracer_provider=provider, exclude_spans=["receive", "send"]
+        )
+    return app, exporter
+
+
+async def rps(app: FastAPI, count: int) -> float:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for _ in range(100):
+            await client.get("/items")
+        start = time.perf_counter()
+        for _ in range(count):
+            await client.get("/items")
+        return count / (time.perf_counter() - start)
+
+
+async def main(count: int) -> None:
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    print(f"{'mode':<10}{'rps':>10}{'vs off':>10}")
+    baseline = None
+    for name, mode in MODES.items():
+        app, _exporter = make_app(mode)
+        result = await rps(app, count)
+        baseline = baseline or result
+        print(f"{name:<10}{result:>10.0f}{result / baseline - 1:>10.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
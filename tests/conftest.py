@@ -4,13 +4,15 @@ from collections.abc import AsyncGenerator
 # Disable OpenTelemetry for tests - MUST be before any app imports
 os.environ["OTEL_ENABLED"] = "false"
 
+import fakeredis
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.main import app
+from app.services import cache
 
 # Test database URL - use SQLite for tests if PostgreSQL not available
 TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "sqlite+aiosqlite:///./test.db")
@@ -49,6 +51,7 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient]:
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -57,3 +60,12 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient]:
         yield ac
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+async def fake_redis(monkeypatch: pytest.MonkeyPatch) -> AsyncGenerator[fakeredis.FakeAsyncRedis]:
+    """Point the cache service at an in-memory Redis."""
+    redis = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(cache, "redis_client", redis)
+    yield redis
+    await redis.aclose()
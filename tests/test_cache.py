@@ -0,0 +1,457 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime
+
+import fakeredis
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.item import Item
+from app.services import cache
+from app.services.cache import (
+    CODECS,
+    ZSTD_FLAG,
+    cached,
+    decode_value,
+    delete_cache,
+    encode_value,
+    get_cache,
+    get_cache_stats,
+    get_many,
+    get_or_compute,
+    get_or_load,
+    item_cache_key,
+    set_cache,
+    set_many,
+)
+
+VALUE = {"id": 1, "name": "Item", "tags": ["a", "b"], "price": 1.5, "owner": None}
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_populates_cache(fake_redis: fakeredis.FakeAsyncRedis) -> None:
+    """Test a miss is loaded once and then served from Redis."""
+    calls = 0
+
+    async def loader() -> dict[str, int]:
+        nonlocal calls
+        calls += 1
+        return {"id": 1}
+
+    assert await get_or_load("key", loader) == {"id": 1}
+    assert await get_or_load("key", loader) == {"id": 1}
+    assert calls == 1
+    assert await get_cache("key") == {"id": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_coalesces_concurrent_misses(
+    fake_redis: fakeredis.FakeAsyncRedis,
+) -> None:
+    """Test concurrent misses on one key share a single load."""
+    calls = 0
+
+    async def loader() -> dict[str, int]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": 1}
+
+    results = await asyncio.gather(*(get_or_load("key", loader) for _ in range(20)))
+    assert all(result == {"id": 1} for result in results)
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_does_not_cache_missing(fake_redis: fakeredis.FakeAsyncRedis) -> None:
+    """Test a missing row is not cached."""
+
+    async def loader() -> None:
+        return None
+
+    assert await get_or_load("key", loader) is None
+    assert await fake_redis.exists("key") == 0
+
+
+@pytest.fixture
+def redis_down(monkeypatch: pytest.MonkeyPatch) -> fakeredis.FakeAsyncRedis:
+    """Point the cache service at a Redis that refuses every command."""
+    server = fakeredis.FakeServer()
+    server.connected = False
+    redis = fakeredis.FakeAsyncRedis(server=server)
+    monkeypatch.setattr(cache, "redis_client", redis)
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_fails_open(redis_down: fakeredis.FakeAsyncRedis) -> None:
+    """Test a Redis outage turns lookups into loads instead of errors."""
+
+    async def loader() -> dict[str, int]:
+        return {"id": 1}
+
+    assert await get_or_load("key", loader) == {"id": 1}
+    await set_cache("key", {"id": 1})
+    assert await get_cache("key") is None
+    await delete_cache("key")
+
+
+@pytest.mark.asyncio
+async def test_batch_operations_fail_open(redis_down: fakeredis.FakeAsyncRedis) -> None:
+    """Test batch reads and writes degrade to misses and no-ops while Redis is down."""
+    await set_many({"a": {"id": 1}, "b": {"id": 2}})
+
+    assert await get_many(["a", "b"]) == [None, None]
+
+
+@pytest.mark.asyncio
+async def test_get_item_while_redis_down(
+    client: AsyncClient, db_session: AsyncSession, redis_down: fakeredis.FakeAsyncRedis
+) -> None:
+    """Test by-id reads are served from the database while Redis is down."""
+    item = Item(name="Item", owner_id=1)
+    db_session.add(item)
+    await db_session.commit()
+
+    response = await client.get(f"/api/v1/items/{item.id}")
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Item"
+
+
+@pytest.mark.asyncio
+async def test_get_item_served_from_cache(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    fake_redis: fakeredis.FakeAsyncRedis,
+) -> None:
+    """Test item reads are served from the cache once populated."""
+    response = await client.post("/api/v1/items", json={"name": "Cached", "description": None})
+    item_id = response.json()["id"]
+    assert await get_cache(item_cache_key(item_id)) is not None
+
+    await db_session.execute(delete(Item))
+    await db_session.commit()
+
+    response = await client.get(f"/api/v1/items/{item_id}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Cached"
+
+
+@pytest.mark.asyncio
+async def test_batch_created_items_are_cached(
+    client: AsyncClient, fake_redis: fakeredis.FakeAsyncRedis
+) -> None:
+    """Test batch creates write every new item through to the cache."""
+    response = await client.post("/api/v1/items:batch", json=[{"name": "A"}, {"name": "B"}])
+    created = response.json()["created"]
+
+    cached_items = await get_many(item_cache_key(item["id"]) for item in created)
+
+    assert cached_items == created
+
+
+@pytest.fixture
+async def local_tier(fake_redis: fakeredis.FakeAsyncRedis) -> AsyncGenerator[None]:
+    """Enable the in-process tier for the duration of a test."""
+    cache.init_local_cache()
+    yield
+    await cache.close_cache()
+
+
+@pytest.mark.asyncio
+async def test_local_tier_serves_without_redis(
+    fake_redis: fakeredis.FakeAsyncRedis, local_tier: None
+) -> None:
+    """Test values set through the cache are served from the local tier."""
+    await set_cache("key", {"id": 1})
+    await fake_redis.delete("key")
+
+    assert await get_cache("key") == {"id": 1}
+    assert get_cache_stats()["local"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_local_tier_populated_from_redis(
+    fake_redis: fakeredis.FakeAsyncRedis, local_tier: None
+) -> None:
+    """Test Redis hits populate the local tier."""
+    await fake_redis.set("key", b'{"id": 1}')
+    redis_hits = get_cache_stats()["redis"]["hits"]
+
+    assert await get_cache("key") == {"id": 1}
+    assert await get_cache("key") == {"id": 1}
+    stats = get_cache_stats()
+    assert stats["redis"]["hits"] == redis_hits + 1
+    assert stats["local"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_broadcast_evicts_local_tier(
+    fake_redis: fakeredis.FakeAsyncRedis,
+    local_tier: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test an invalidation published by another worker evicts the local copy."""
+    monkeypatch.setattr(cache.settings, "CACHE_L1_ENABLED", True)
+    await set_cache("key", {"id": 1})
+    await asyncio.sleep(0.05)  # let the listener subscribe
+
+    # Simulate another worker deleting the key
+    await fake_redis.delete("key")
+    await fake_redis.publish(cache.settings.CACHE_INVALIDATION_CHANNEL, "other-worker key")
+    await asyncio.sleep(0.05)
+
+    assert await get_cache("key") is None
+
+
+@pytest.mark.asyncio
+async def test_overwrites_are_broadcast(
+    fake_redis: fakeredis.FakeAsyncRedis,
+    local_tier: None,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test writes tell other workers to evict their copies but keep the writer's own."""
+    monkeypatch.setattr(cache.settings, "CACHE_L1_ENABLED", True)
+    await asyncio.sleep(0.05)  # let the listener subscribe
+    pubsub = fake_redis.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(cache.settings.CACHE_INVALIDATION_CHANNEL)
+
+    await set_cache("a", {"id": 1})
+    await set_many({"b": {"id": 2}})
+    await delete_cache("c")
+    keys = []
+    for _ in range(4):  # the first read consumes the subscribe confirmation
+        message = await pubsub.get_message(timeout=1)
+        if message is not None:
+            keys.append(message["data"].decode().split(" ")[1])
+    await pubsub.aclose()
+    await asyncio.sleep(0.05)
+
+    assert keys == ["a", "b", "c"]
+    await fake_redis.delete("a", "b")
+    assert await get_many(["a", "b"]) == [{"id": 1}, {"id": 2}]
+
+
+@pytest.mark.parametrize("codec", ["json", "msgpack"])
+def test_codecs_round_trip(codec: str) -> None:
+    """Test each codec tags its entries and decodes them back."""
+    if codec == "msgpack":
+        pytest.importorskip("msgpack")
+    raw = encode_value(VALUE, CODECS[codec])
+
+    assert raw[0] == CODECS[codec].header
+    assert decode_value(raw) == VALUE
+
+
+@pytest.mark.parametrize("codec", ["json", "msgpack"])
+def test_datetimes_decode_as_json(codec: str) -> None:
+    """Test datetimes decode to their JSON form whichever codec wrote them."""
+    if codec == "msgpack":
+        pytest.importorskip("msgpack")
+    value = {"updated_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)}
+
+    assert decode_value(encode_value(value, CODECS[codec])) == {
+        "updated_at": "2026-01-02T03:04:05Z"
+    }
+
+
+def test_large_values_are_compressed(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test values over the threshold are zstd-compressed and flagged."""
+    pytest.importorskip("zstandard")
+    monkeypatch.setattr(cache.settings, "CACHE_COMPRESSION_MIN_BYTES", 100)
+    large = [VALUE] * 100
+
+    raw = encode_value(large)
+    small = encode_value(VALUE)
+
+    assert raw[0] == CODECS["json"].header | ZSTD_FLAG
+    assert len(raw) < len(CODECS["json"].encode(large))
+    assert decode_value(raw) == large
+    assert small[0] == CODECS["json"].header
+
+
+@pytest.mark.asyncio
+async def test_headerless_entries_still_read(fake_redis: fakeredis.FakeAsyncRedis) -> None:
+    """Test JSON entries written before codec headers decode as JSON."""
+    await fake_redis.set("key", b' {"id": 1}')
+
+    assert await get_cache("key") == {"id": 1}
+
+
+@pytest.mark.asyncio
+async def test_corrupt_compressed_entry_is_a_miss(fake_redis: fakeredis.FakeAsyncRedis) -> None:
+    """Test an entry whose zstd payload does not decompress is dropped as a miss."""
+    pytest.importorskip("zstandard")
+    await fake_redis.set("key", bytes((CODECS["json"].header | ZSTD_FLAG,)) + b"not zstd")
+
+    assert await get_cache("key") is None
+    assert await fake_redis.exists("key") == 0
+
+
+@pytest.mark.asyncio
+async def test_get_many_uses_one_round_trip(
+    fake_redis: fakeredis.FakeAsyncRedis, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test batch reads return values in key order with one MGET."""
+    await set_many({"a": {"id": 1}, "c": {"id": 3}}, ttl=60)
+    assert 0 < await fake_redis.ttl("a") <= 60
+
+    calls = []
+    mget = fake_redis.mget
+
+    async def counting_mget(keys: list[str]) -> list[bytes | str | None]:
+        calls.append(keys)
+        return await mget(keys)
+
+    monkeypatch.setattr(fake_redis, "mget", counting_mget)
+
+    assert await get_many(["a", "b", "c"]) == [{"id": 1}, None, {"id": 3}]
+    assert calls == [["a", "b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_get_many_reads_local_tier_first(
+    fake_redis: fakeredis.FakeAsyncRedis, local_tier: None
+) -> None:
+    """Test batch reads only ask Redis for keys missing locally."""
+    await set_many({"a": {"id": 1}}, ttl=60)
+    await fake_redis.set("b", encode_value({"id": 2}))
+    await fake_redis.delete("a")
+
+    assert await get_many(["a", "b"]) == [{"id": 1}, {"id": 2}]
+    assert await get_cache("b") == {"id": 2}
+    assert get_cache_stats()["local"]["hits"] == 2
+
+
+class Counter:
+    """Async compute function counting its calls."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self) -> dict[str, int]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"version": self.calls}
+
+
+async def settle() -> None:
+    """Wait for background refreshes to finish."""
+    await asyncio.gather(*cache._refreshing.values())
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_caches(fake_redis: fakeredis.FakeAsyncRedis) -> None:
+    """Test a miss is computed once, stored with a TTL covering the stale window."""
+    compute = Counter()
+
+    assert await get_or_compute("key", compute, ttl=60, stale_ttl=30) == {"version": 1}
+    assert await get_or_compute("key", compute, ttl=60, stale_ttl=30) == {"version": 1}
+    assert compute.calls == 1
+    assert 60 < await fake_redis.ttl("key") <= 90
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_coalesces_concurrent_misses(
+    fake_redis: fakeredis.FakeAsyncRedis,
+) -> None:
+    """Test concurrent misses in one process share a single computation."""
+    compute = Counter(delay=0.01)
+
+    results = await asyncio.gather(*(get_or_compute("key", compute) for _ in range(20)))
+
+    assert all(result == {"version": 1} for result in results)
+    assert compute.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_value_served_while_refreshing(
+    fake_redis: fakeredis.FakeAsyncRedis,
+) -> None:
+    """Test an expired value is returned at once and refreshed in the background."""
+    compute = Counter(delay=0.01)
+    await get_or_compute("key", compute, ttl=0, stale_ttl=60)
+
+    results = await asyncio.gather(*(get_or_compute("key", compute, ttl=60) for _ in range(5)))
+    assert results == [{"version": 1}] * 5
+
+    await settle()
+    assert compute.calls == 2
+    assert await get_or_compute("key", compute, ttl=60) == {"version": 2}
+
+
+@pytest.mark.asyncio
+async def test_refresh_skipped_while_another_process_holds_lock(
+    fake_redis: fakeredis.FakeAsyncRedis,
+) -> None:
+    """Test only the lock holder recomputes an expired key."""
+    compute = Counter()
+    await get_or_compute("key", compute, ttl=0, stale_ttl=60)
+    await fake_redis.set("lock:key", b"other-process", px=5000)
+
+    assert await get_or_compute("key", compute) == {"version": 1}
+    await settle()
+    assert compute.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cold_miss_waits_for_lock_holder(fake_redis: fakeredis.FakeAsyncRedis) -> None:
+    """Test a miss waits for another process's result instead of computing."""
+    compute = Counter()
+    await fake_redis.set("lock:key", b"other-process", px=5000)
+
+    async def other_process() -> None:
+        await asyncio.sleep(0.02)
+        await cache.set_cache("key", [{"version": 0}, 0.01, 2e9], 60)
+
+    results = await asyncio.gather(get_or_compute("key", compute), other_process())
+
+    assert results[0] == {"version": 0}
+    assert compute.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_fails_open(redis_down: fakeredis.FakeAsyncRedis) -> None:
+    """Test a Redis outage computes values directly instead of raising from the lock."""
+    compute = Counter()
+
+    assert await get_or_compute("key", compute) == {"version": 1}
+    assert await get_or_compute("key", compute) == {"version": 2}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("beta", "refreshed"), [(0.0, False), (1e9, True)])
+async def test_xfetch_early_refresh(
+    fake_redis: fakeredis.FakeAsyncRedis,
+    monkeypatch: pytest.MonkeyPatch,
+    beta: float,
+    refreshed: bool,
+) -> None:
+    """Test fresh values are refreshed early only as XFetch decides."""
+    monkeypatch.setattr(cache.settings, "CACHE_XFETCH_BETA", beta)
+    compute = Counter(delay=0.001)
+    await get_or_compute("key", compute, ttl=60)
+
+    assert await get_or_compute("key", compute, ttl=60) == {"version": 1}
+    await settle()
+    assert compute.calls == (2 if refreshed else 1)
+
+
+@pytest.mark.asyncio
+async def test_cached_decorator(fake_redis: fakeredis.FakeAsyncRedis) -> None:
+    """Test the decorator keys results by the helper's arguments."""
+    calls = []
+
+    @cached(lambda owner_id: f"owner:{owner_id}")
+    async def owner_summary(owner_id: int) -> dict[str, int]:
+        calls.append(owner_id)
+        return {"owner_id": owner_id}
+
+    assert await owner_summary(1) == {"owner_id": 1}
+    assert await owner_summary(1) == {"owner_id": 1}
+    assert await owner_summary(owner_id=2) == {"owner_id": 2}
+    assert calls == [1, 2]
@@ -0,0 +1,172 @@
+import gzip
+import json
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.core.compression import (
+    CompressionMiddleware,
+    Encoder,
+    brotli_encoder,
+    gzip_encoder,
+    negotiate,
+)
+from app.services.local_cache import LocalCache
+
+BODY = json.dumps([{"id": i, "name": f"Item {i}"} for i in range(100)]).encode()
+
+
+def make_app(encoders: list[Encoder], cache: LocalCache | None = None) -> FastAPI:
+    app = FastAPI()
+    app.state.etag = 'W/"1"'
+
+    @app.get("/page")
+    async def page() -> Response:
+        return Response(BODY, media_type="application/json", headers={"ETag": app.state.etag})
+
+    @app.get("/small")
+    async def small() -> Response:
+        return Response(b'{"ok":true}', media_type="application/json")
+
+    @app.get("/image")
+    async def image() -> Response:
+        return Response(BODY, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def lines() -> AsyncIterator[bytes]:
+            for i in range(100):
+                yield json.dumps({"id": i}).encode() + b"\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    app.add_middleware(
+        CompressionMiddleware,
+        encoders=encoders,
+        excluded_content_types=["image/"],
+        cache=cache,
+    )
+    return app
+
+
+def client_for(app: FastAPI) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, br, zstd", "zstd"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0.9, gzip;q=0.8", "br"),
+        ("*", "zstd"),
+        ("*;q=0.5, zstd;q=0", "br"),
+        ("gzip;q=0", None),
+        ("identity", None),
+        ("GZIP", "gzip"),
+    ],
+)
+def test_negotiate(header: str, expected: str | None) -> None:
+    """Test the highest q-value wins and ties follow server preference."""
+    assert negotiate(header, ("zstd", "br", "gzip")) == expected
+
+
+@pytest.mark.asyncio
+async def test_compresses_large_responses() -> None:
+    """Test large bodies are gzipped with the right headers."""
+    async with client_for(make_app([gzip_encoder(6)])) as ac:
+        response = await ac.get("/page", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) < len(BODY)
+    assert response.content == BODY
+
+
+@pytest.mark.asyncio
+async def test_skips_small_excluded_and_unaccepted() -> None:
+    """Test small bodies, excluded types and identity-only clients are sent as is."""
+    async with client_for(make_app([gzip_encoder(6)])) as ac:
+        small = await ac.get("/small", headers={"Accept-Encoding": "gzip"})
+        image = await ac.get("/image", headers={"Accept-Encoding": "gzip"})
+        identity = await ac.get("/page", headers={"Accept-Encoding": "identity"})
+
+    for response in (small, image, identity):
+        assert "Content-Encoding" not in response.headers
+    assert "Vary" not in image.headers
+    # The identity response is still one of several representations
+    assert identity.headers["Vary"] == "Accept-Encoding"
+    assert identity.content == BODY
+
+
+@pytest.mark.asyncio
+async def test_streams_are_compressed_incrementally() -> None:
+    """Test streamed bodies are compressed without a Content-Length."""
+    async with (
+        client_for(make_app([gzip_encoder(6)])) as ac,
+        ac.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response,
+    ):
+        raw = b"".join([chunk async for chunk in response.aiter_raw()])
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    lines = gzip.decompress(raw).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == list(range(100))
+
+
+@pytest.mark.asyncio
+async def test_brotli() -> None:
+    """Test brotli is used when preferred and installed."""
+    brotli = pytest.importorskip("brotli")
+    app = make_app([brotli_encoder(4), gzip_encoder(6)])
+
+    async with client_for(app) as ac:
+        response = await ac.get("/page", headers={"Accept-Encoding": "gzip, br"})
+        assert response.headers["Content-Encoding"] == "br"
+
+        async with ac.stream("GET", "/stream", headers={"Accept-Encoding": "br"}) as stream:
+            raw = b"".join([chunk async for chunk in stream.aiter_raw()])
+
+    assert len(brotli.decompress(raw).splitlines()) == 100
+
+
+@pytest.mark.asyncio
+async def test_compressed_bodies_are_reused_per_etag() -> None:
+    """Test ETag-validated bodies are compressed once per ETag and encoding."""
+    calls = []
+
+    def counting_gzip(data: bytes) -> bytes:
+        calls.append(len(data))
+        return gzip_encoder(6).compress(data)
+
+    encoder = Encoder("gzip", counting_gzip, gzip_encoder(6).stream)
+    cache = LocalCache(max_entries=10, max_bytes=1_000_000, ttl=60)
+    app = make_app([encoder], cache=cache)
+
+    async with client_for(app) as ac:
+        first = await ac.get("/page", headers={"Accept-Encoding": "gzip"})
+        second = await ac.get("/page", headers={"Accept-Encoding": "gzip"})
+        app.state.etag = 'W/"2"'
+        changed = await ac.get("/page", headers={"Accept-Encoding": "gzip"})
+
+    assert first.content == second.content == changed.content == BODY
+    assert len(calls) == 2
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_item_list_is_compressed(client: AsyncClient) -> None:
+    """Test the application compresses large list responses."""
+    await client.post(
+        "/api/v1/items:batch",
+        json=[{"name": f"Item {i}", "description": "x" * 20} for i in range(50)],
+    )
+
+    response = await client.get("/api/v1/items", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(response.json()) == 50
@@ -0,0 +1,130 @@
+import time
+from collections.abc import AsyncGenerator
+
+import fakeredis
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import QueuePool
+
+from app.core import health
+from app.core.config import settings
+from app.db import session
+from app.services import cache
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.fixture
+async def dependencies(
+    monkeypatch: pytest.MonkeyPatch, fake_redis: fakeredis.FakeAsyncRedis
+) -> AsyncGenerator[None]:
+    """Point the health checks at the test database and Redis."""
+    engine = create_async_engine(TEST_DATABASE_URL)
+    monkeypatch.setattr(session, "engine", engine)
+    monkeypatch.setattr(health, "_checks", {})
+    monkeypatch.setattr(health, "_checked_at", None)
+    yield
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_not_ready_before_first_check(client: AsyncClient, dependencies: None) -> None:
+    """Test /ready fails until dependencies have been checked."""
+    response = await client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+
+@pytest.mark.asyncio
+async def test_ready(client: AsyncClient, dependencies: None) -> None:
+    """Test /ready reports the cached dependency check results."""
+    await health.refresh()
+
+    response = await client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "checks": {"database": "ok", "redis": "ok"}}
+
+
+@pytest.mark.asyncio
+async def test_dependency_down(
+    client: AsyncClient, dependencies: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a failed dependency makes the service unready."""
+    monkeypatch.setattr(cache, "redis_client", None)
+    await health.refresh()
+
+    response = await client.get("/ready")
+
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "not ready"
+    assert body["checks"]["database"] == "ok"
+    assert body["checks"]["redis"].startswith("error")
+
+
+@pytest.mark.asyncio
+async def test_stale_results_are_not_ready(
+    client: AsyncClient, dependencies: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test results the background checker has stopped refreshing are not trusted."""
+    await health.refresh()
+    monkeypatch.setattr(health, "_checked_at", time.monotonic() - 3600)
+
+    response = await client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "stale"
+
+
+@pytest.mark.asyncio
+async def test_warm_db_pool(db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test warm-up leaves DB_POOL_SIZE open connections idle in the pool."""
+    engine = create_async_engine(TEST_DATABASE_URL, pool_size=3)
+    monkeypatch.setattr(session, "engine", engine)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+
+    try:
+        await session.warm_db_pool()
+        pool = engine.pool
+        assert isinstance(pool, QueuePool)
+        assert pool.checkedin() == 3
+        assert pool.checkedout() == 0
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test Redis warm-up opens connections ahead of first use."""
+    pool = fakeredis.FakeAsyncRedis().connection_pool
+    monkeypatch.setattr(cache, "redis_pool", pool)
+
+    await cache.warm_cache_pool(3)
+
+    assert len(pool._available_connections) == 3
+
+
+@pytest.mark.asyncio
+async def test_startup_survives_unreachable_dependencies(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test startup logs unreachable dependencies and leaves /ready to report them."""
+    monkeypatch.setattr(settings, "DATABASE_URL", "sqlite+aiosqlite:////nonexistent/dir/app.db")
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", [])
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://127.0.0.1:1/0")
+    for name in ("engine", "async_session_maker", "primary_read_session_maker", "replicas"):
+        monkeypatch.setattr(session, name, getattr(session, name))
+    monkeypatch.setattr(cache, "redis_client", None)
+    monkeypatch.setattr(cache, "redis_pool", None)
+
+    await session.init_db_pool()
+    await cache.init_cache()
+    try:
+        checks = await health.check_dependencies()
+    finally:
+        await cache.close_cache()
+        await session.close_db_pool()
+
+    assert checks["database"].startswith("error")
+    assert checks["redis"].startswith("error")
@@ -1,3 +1,6 @@
+import json
+from datetime import UTC, datetime, timedelta
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -53,3 +56,236 @@ async def test_get_nonexistent_item(client: AsyncClient) -> None:
     """Test getting a nonexistent item."""
     response = await client.get("/api/v1/items/999")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_items_cursor_pagination(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test walking all items with the keyset cursor."""
+    db_session.add_all([Item(name=f"Item {i}", owner_id=1) for i in range(5)])
+    await db_session.commit()
+
+    seen: list[int] = []
+    response = await client.get("/api/v1/items", params={"limit": 2})
+    while True:
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = await client.get("/api/v1/items", params={"limit": 2, "cursor": cursor})
+
+    assert seen == sorted(seen)
+    assert len(seen) == 5
+
+
+@pytest.mark.asyncio
+async def test_list_items_cursor_by_created_at(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Test keyset pagination over (created_at, id) including timestamp ties."""
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    timestamps = [base + timedelta(minutes=m) for m in (2, 0, 1, 1)]
+    db_session.add_all(
+        [
+            Item(name=f"Item {i}", owner_id=1, created_at=ts, updated_at=ts)
+            for i, ts in enumerate(timestamps)
+        ]
+    )
+    await db_session.commit()
+
+    params = {"limit": 2, "order_by": "created_at"}
+    first = await client.get("/api/v1/items", params=params)
+    cursor = first.headers["X-Next-Cursor"]
+    second = await client.get("/api/v1/items", params={**params, "cursor": cursor})
+
+    names = [item["name"] for item in first.json() + second.json()]
+    assert names == ["Item 1", "Item 2", "Item 3", "Item 0"]
+    assert "X-Next-Cursor" in second.headers  # full page; next one is empty
+
+
+@pytest.mark.asyncio
+async def test_list_items_cursor_by_server_created_at(client: AsyncClient) -> None:
+    """Test created_at cursors page through rows timestamped by the database."""
+    created = [
+        (await client.post("/api/v1/items", json={"name": f"Item {i}"})).json()["id"]
+        for i in range(10)
+    ]
+
+    ids: list[int] = []
+    params: dict[str, str | int] = {"limit": 3, "order_by": "created_at"}
+    while True:
+        response = await client.get("/api/v1/items", params=params)
+        ids += [item["id"] for item in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert ids == created
+
+
+@pytest.mark.asyncio
+async def test_list_items_invalid_cursor(client: AsyncClient) -> None:
+    """Test a malformed or mismatched cursor is rejected."""
+    response = await client.get("/api/v1/items", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    first_page_cursor = "eyJvIjoiaWQiLCJ2IjpbMV19"  # {"o":"id","v":[1]}
+    response = await client.get(
+        "/api/v1/items", params={"cursor": first_page_cursor, "order_by": "created_at"}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_items_ndjson(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test exporting items as NDJSON with owner and updated_at filters."""
+    old = datetime(2024, 1, 1, tzinfo=UTC)
+    new = datetime(2025, 1, 1, tzinfo=UTC)
+    db_session.add_all(
+        [
+            Item(name="Old", owner_id=1, created_at=old, updated_at=old),
+            Item(name="New", owner_id=1, created_at=new, updated_at=new),
+            Item(name="Other owner", owner_id=2, created_at=new, updated_at=new),
+        ]
+    )
+    await db_session.commit()
+
+    response = await client.get("/api/v1/items/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["Old", "New", "Other owner"]
+
+    response = await client.get(
+        "/api/v1/items/export",
+        params={"owner_id": 1, "updated_since": "2024-06-01T00:00:00Z"},
+    )
+    assert [json.loads(line)["name"] for line in response.text.splitlines()] == ["New"]
+
+
+@pytest.mark.asyncio
+async def test_create_items_batch(client: AsyncClient) -> None:
+    """Test batch creation inserts valid rows and reports invalid ones."""
+    response = await client.post(
+        "/api/v1/items:batch",
+        json=[
+            {"name": "First", "description": "One"},
+            {"name": ""},
+            {"name": "Second"},
+        ],
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert [item["name"] for item in data["created"]] == ["First", "Second"]
+    assert all(item["created_at"] for item in data["created"])
+    assert [error["index"] for error in data["errors"]] == [1]
+
+    response = await client.get("/api/v1/items")
+    assert len(response.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_item_conditional(client: AsyncClient) -> None:
+    """Test If-None-Match with the current ETag returns an empty 304."""
+    created = await client.post("/api/v1/items", json={"name": "Polled"})
+    url = f"/api/v1/items/{created.json()['id']}"
+
+    response = await client.get(url)
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = await client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = await client.get(url, headers={"If-None-Match": 'W/"stale"'})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_list_items_conditional(client: AsyncClient) -> None:
+    """Test a list ETag holds until the page's rows change."""
+    await client.post("/api/v1/items", json={"name": "First"})
+    etag = (await client.get("/api/v1/items")).headers["ETag"]
+
+    response = await client.get("/api/v1/items", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    await client.post("/api/v1/items", json={"name": "Second"})
+    response = await client.get("/api/v1/items", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_get_items_by_ids(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test ids returns items in request order, once each, skipping unknown ids."""
+    items = [Item(name=f"Item {i}", owner_id=1) for i in range(3)]
+    db_session.add_all(items)
+    await db_session.commit()
+    a, b, c = (item.id for item in items)
+
+    response = await client.get("/api/v1/items", params={"ids": f"{c},999,{a},{c}"})
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [c, a]
+    etag = response.headers["ETag"]
+    response = await client.get(
+        "/api/v1/items", params={"ids": f"{c},999,{a}"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_get_items_by_ids_validation(client: AsyncClient) -> None:
+    """Test malformed or oversized id lists are rejected."""
+    response = await client.get("/api/v1/items", params={"ids": "1,x"})
+    assert response.status_code == 422
+
+    response = await client.get("/api/v1/items", params={"ids": ",".join(map(str, range(101)))})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_items_by_owner(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test owner_id filters the listing and keyset pages stay within the owner."""
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    db_session.add_all(
+        Item(name=f"Item {i}", owner_id=i % 2 + 1, created_at=base + timedelta(minutes=i // 3))
+        for i in range(7)
+    )
+    await db_session.commit()
+
+    params = {"owner_id": 2, "order_by": "created_at", "limit": 2}
+    seen: list[int] = []
+    response = await client.get("/api/v1/items", params=params)
+    while True:
+        page = response.json()
+        assert all(item["owner_id"] == 2 for item in page)
+        seen.extend(item["id"] for item in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = await client.get("/api/v1/items", params={**params, "cursor": cursor})
+
+    assert len(seen) == len(set(seen)) == 3
+
+
+@pytest.mark.asyncio
+async def test_list_items_total(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test include_total reports the count of the whole (filtered) listing."""
+    db_session.add_all(Item(name=f"Item {i}", owner_id=i % 2 + 1) for i in range(5))
+    await db_session.commit()
+
+    response = await client.get("/api/v1/items", params={"limit": 1, "include_total": True})
+    assert response.headers["X-Total-Count"] == "5"
+
+    response = await client.get(
+        "/api/v1/items", params={"owner_id": 1, "limit": 1, "include_total": True}
+    )
+    assert response.headers["X-Total-Count"] == "3"
+
+    response = await client.get("/api/v1/items")
+    assert "X-Total-Count" not in response.headers
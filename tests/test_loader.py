@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.items import item_loader
+from app.db.columns import ITEM_COLUMNS
+from app.db.loader import BatchLoader, id_in
+from app.models.item import Item
+
+
+class RecordingFetch:
+    """Fetch function recording each batch of keys."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.batches: list[list[int]] = []
+        self.fail = fail
+
+    async def __call__(self, db: AsyncSession, keys: list[int]) -> dict[int, str]:
+        self.batches.append(keys)
+        if self.fail:
+            raise RuntimeError("boom")
+        return {key: f"value {key}" for key in keys if key < 100}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_fetch(db_session: AsyncSession) -> None:
+    """Test concurrent lookups within the window become one fetch."""
+    fetch = RecordingFetch()
+    loader = BatchLoader(fetch, window=0.001)
+
+    results = await asyncio.gather(
+        loader.load(db_session, 1),
+        loader.load(db_session, 2),
+        loader.load_many(db_session, [2, 3, 100]),
+    )
+
+    assert results == ["value 1", "value 2", ["value 2", "value 3", None]]
+    assert fetch.batches == [[1, 2, 3, 100]]
+
+
+@pytest.mark.asyncio
+async def test_full_batches_are_split(db_session: AsyncSession) -> None:
+    """Test a batch is closed once it holds max_size keys."""
+    fetch = RecordingFetch()
+    loader = BatchLoader(fetch, window=0.001, max_size=2)
+
+    await asyncio.gather(*(loader.load(db_session, key) for key in range(5)))
+
+    assert fetch.batches == [[0, 1], [2, 3], [4]]
+
+
+@pytest.mark.asyncio
+async def test_fetch_errors_reach_every_caller(db_session: AsyncSession) -> None:
+    """Test a failed fetch fails each lookup in the batch."""
+    loader = BatchLoader(RecordingFetch(fail=True), window=0.001)
+
+    results = await asyncio.gather(
+        loader.load(db_session, 1), loader.load(db_session, 2), return_exceptions=True
+    )
+
+    assert [str(result) for result in results] == ["boom", "boom"]
+
+
+@pytest.mark.asyncio
+async def test_item_lookups_issue_one_query(db_session: AsyncSession) -> None:
+    """Test N concurrent item lookups run a single SELECT."""
+    items = [Item(name=f"Item {i}", owner_id=1) for i in range(10)]
+    db_session.add_all(items)
+    await db_session.commit()
+
+    statements: list[str] = []
+
+    def record(_conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        results = await asyncio.gather(*(item_loader.load(db_session, item.id) for item in items))
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert [result and result["name"] for result in results] == [item.name for item in items]
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+
+
+def test_id_in_uses_any_on_postgres() -> None:
+    """Test Postgres gets one array parameter whatever the batch size."""
+    stmt = select(*ITEM_COLUMNS).where(id_in(Item.id, "postgresql"))
+    sql = str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+
+    assert "= ANY (" in sql
+    assert "IN (" not in sql
@@ -0,0 +1,53 @@
+import time
+
+import pytest
+
+from app.services.local_cache import LocalCache
+
+
+def test_lru_eviction_by_entries() -> None:
+    """Test the least recently used entry is evicted first."""
+    cache = LocalCache(max_entries=2, max_bytes=1000, ttl=60)
+    cache.set("a", 1, 1)
+    cache.set("b", 2, 1)
+    assert cache.get("a") == 1
+    cache.set("c", 3, 1)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_eviction_by_bytes() -> None:
+    """Test entries are evicted to stay under the byte budget."""
+    cache = LocalCache(max_entries=100, max_bytes=10, ttl=60)
+    cache.set("a", "a", 6)
+    cache.set("b", "b", 6)
+
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 6
+
+    cache.set("huge", "x", 11)
+    assert cache.get("huge") is None
+
+
+def test_ttl_expiry(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test expired entries are treated as misses."""
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache = LocalCache(max_entries=10, max_bytes=100, ttl=5)
+    cache.set("a", 1, 1)
+    cache.set("b", 2, 1, ttl=60)
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+    assert cache.get("a") is None
+    assert cache.get("b") is None  # capped at the tier TTL
+    assert cache.stats() == {
+        "hits": 0,
+        "misses": 2,
+        "evictions": 0,
+        "expirations": 2,
+        "entries": 0,
+        "bytes": 0,
+    }
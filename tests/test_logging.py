@@ -0,0 +1,61 @@
+import io
+import json
+import time
+
+import structlog
+
+from app.core.logging import LogWriter, QueueLoggerFactory, _hand_off
+
+
+def wait_for_output(stream: io.BytesIO, lines: int) -> list[dict[str, object]]:
+    deadline = time.monotonic() + 2
+    while stream.getvalue().count(b"\n") < lines and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_queue_logger_writes_json_lines() -> None:
+    """Test events logged on the caller are written by the background thread."""
+    stream = io.BytesIO()
+    writer = LogWriter(stream, maxsize=100, batch_size=10)
+    writer.start()
+    logger = structlog.wrap_logger(
+        QueueLoggerFactory(writer)(),
+        processors=[structlog.processors.add_log_level, _hand_off],
+        wrapper_class=structlog.make_filtering_bound_logger(0),
+    )
+
+    logger.info("first", request_id=1)
+    logger.error("second")
+    events = wait_for_output(stream, 2)
+    writer.stop()
+
+    assert events == [
+        {"event": "first", "request_id": 1, "level": "info"},
+        {"event": "second", "level": "error"},
+    ]
+
+
+def test_full_queue_drops_events() -> None:
+    """Test a full queue drops and counts events instead of blocking."""
+    stream = io.BytesIO()
+    writer = LogWriter(stream, maxsize=2, batch_size=10)
+
+    for i in range(5):
+        writer.enqueue({"event": str(i)})
+    assert writer.dropped == 3
+
+    writer.start()
+    writer.stop()
+    assert [event["event"] for event in wait_for_output(stream, 2)] == ["0", "1"]
+
+
+def test_events_after_stop_are_written_inline() -> None:
+    """Test events logged after shutdown are not lost."""
+    stream = io.BytesIO()
+    writer = LogWriter(stream, maxsize=10, batch_size=10)
+    writer.start()
+    writer.stop()
+
+    writer.enqueue({"event": "late"})
+    assert json.loads(stream.getvalue()) == {"event": "late"}
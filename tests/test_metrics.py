@@ -0,0 +1,42 @@
+import pytest
+from httpx import AsyncClient
+
+from app.services import cache
+
+
+def sample(body: str, name: str, **labels: str) -> float:
+    """Value of the first exposition line for ``name`` carrying ``labels``."""
+    for line in body.splitlines():
+        if line.startswith(name + "{") and all(f'{k}="{v}"' in line for k, v in labels.items()):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client: AsyncClient) -> None:
+    """Test request latency is labelled by route template, not raw path."""
+    await client.get("/api/v1/items/12345")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/api/v1/items/{item_id}"' in response.text
+    assert 'route="/api/v1/items/12345"' not in response.text
+
+
+@pytest.mark.asyncio
+async def test_cache_metrics(client: AsyncClient, fake_redis: None) -> None:
+    """Test Redis lookups are counted by result and timed."""
+    before = (await client.get("/metrics")).text
+
+    await cache.set_cache("metrics:key", {"a": 1})
+    await cache.get_cache("metrics:key")
+    await cache.get_cache("metrics:missing")
+
+    after = (await client.get("/metrics")).text
+    for result in ("hit", "miss"):
+        delta = sample(after, "cache_requests_total", tier="redis", result=result) - sample(
+            before, "cache_requests_total", tier="redis", result=result
+        )
+        assert delta == 1
+    assert sample(after, "redis_command_duration_seconds_count", command="get") >= 2
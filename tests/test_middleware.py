@@ -0,0 +1,52 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from structlog.testing import capture_logs
+
+from app.core.middleware import RequestLoggingMiddleware
+
+
+def make_app(sample_rate: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict[str, str]:
+        return {"status": "ok"}
+
+    app.add_middleware(RequestLoggingMiddleware, sample_rate=sample_rate)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_request_logging(client: AsyncClient) -> None:
+    """Test requests are timed and logged."""
+    with capture_logs() as logs:
+        response = await client.get("/health")
+
+    assert response.status_code == 200
+    assert float(response.headers["X-Process-Time"]) >= 0
+    completed = [log for log in logs if log["event"] == "request_completed"]
+    assert completed == [
+        {
+            "event": "request_completed",
+            "log_level": "info",
+            "method": "GET",
+            "path": "/health",
+            "status_code": 200,
+            "duration_ms": completed[0]["duration_ms"],
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_success_logs_are_sampled() -> None:
+    """Test sampling drops success logs but always keeps errors."""
+    app = make_app(sample_rate=0.0)
+
+    with capture_logs() as logs:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            ok = await ac.get("/ping")
+            missing = await ac.get("/missing")
+
+    assert "X-Process-Time" in ok.headers
+    assert [log["status_code"] for log in logs] == [missing.status_code]
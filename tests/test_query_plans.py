@@ -0,0 +1,45 @@
+from typing import Any
+
+import pytest
+from sqlalchemy import Select, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.pagination import encode_cursor
+from app.api.v1.items import item_page_query
+from app.models.item import Item
+
+OWNER_INDEX = "ix_items_owner_id_created_at_id"
+
+
+async def query_plan(db: AsyncSession, stmt: Select[*tuple[Any, ...]]) -> str:
+    """The plan SQLite (or Postgres, with sequential scans off) picks for ``stmt``."""
+    assert db.bind is not None
+    if db.bind.dialect.name == "postgresql":
+        await db.execute(text("SET LOCAL enable_seqscan = off"))
+        rows = await db.execute(text(f"EXPLAIN {stmt.compile(db.bind)}"), stmt.compile().params)
+        return "\n".join(row[0] for row in rows)
+
+    compiled = stmt.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    rows = await db.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("paged", [False, True], ids=["first-page", "cursor"])
+async def test_owner_listing_uses_composite_index(db_session: AsyncSession, paged: bool) -> None:
+    """Test owner pages in created_at order are read from the index, without a sort."""
+    db_session.add_all(Item(name=f"Item {i}", owner_id=i % 3) for i in range(30))
+    await db_session.commit()
+    cursor = None
+    if paged:
+        first_page = item_page_query(order_by="created_at", limit=1)
+        last = (await db_session.execute(*first_page)).one()
+        cursor = encode_cursor("created_at", [last._mapping["created_at"], last._mapping["id"]])
+
+    stmt, params = item_page_query(order_by="created_at", limit=10, cursor=cursor, owner_id=1)
+    plan = await query_plan(db_session, stmt.params(params))
+
+    assert OWNER_INDEX in plan
+    assert "TEMP B-TREE" not in plan
+    assert "Sort" not in plan
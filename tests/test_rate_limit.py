@@ -0,0 +1,121 @@
+from typing import Any
+
+import fakeredis
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import settings
+from app.core.rate_limit import RateLimitMiddleware
+
+
+def make_app(monkeypatch: pytest.MonkeyPatch, **overrides: object) -> FastAPI:
+    """Build a minimal app behind the rate limiter with patched settings."""
+    for name, value in overrides.items():
+        monkeypatch.setattr(settings, name, value)
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/health")
+    async def health() -> dict[str, str]:
+        return {"status": "healthy"}
+
+    app.add_middleware(RateLimitMiddleware)
+    return app
+
+
+def make_client(app: FastAPI) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_rejects_after_limit(
+    monkeypatch: pytest.MonkeyPatch, fake_redis: fakeredis.FakeAsyncRedis
+) -> None:
+    """Test requests over the limit get 429 with Retry-After."""
+    app = make_app(monkeypatch, RATE_LIMIT_PER_MINUTE=3)
+
+    async with make_client(app) as client:
+        responses = [await client.get("/ping") for _ in range(4)]
+
+    assert [r.status_code for r in responses] == [200, 200, 200, 429]
+    assert [r.headers["ratelimit-remaining"] for r in responses] == ["2", "1", "0", "0"]
+    assert responses[0].headers["ratelimit-limit"] == "3"
+    assert int(responses[3].headers["retry-after"]) >= 1
+    assert responses[3].json() == {"detail": "Rate limit exceeded"}
+
+
+@pytest.mark.asyncio
+async def test_local_lease_avoids_redis_round_trips(
+    monkeypatch: pytest.MonkeyPatch, fake_redis: fakeredis.FakeAsyncRedis
+) -> None:
+    """Test most allowed requests are served from locally reserved tokens."""
+    app = make_app(monkeypatch, RATE_LIMIT_PER_MINUTE=1000, RATE_LIMIT_LOCAL_BATCH=50)
+    calls = 0
+    original = fake_redis.evalsha
+
+    async def counting_evalsha(*args: Any, **kwargs: Any) -> Any:
+        nonlocal calls
+        calls += 1
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(fake_redis, "evalsha", counting_evalsha)
+
+    async with make_client(app) as client:
+        responses = [await client.get("/ping") for _ in range(100)]
+
+    assert all(r.status_code == 200 for r in responses)
+    # Two reservations of 50 tokens; the first retries once after SCRIPT LOAD
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_buckets_per_client_and_route(
+    monkeypatch: pytest.MonkeyPatch, fake_redis: fakeredis.FakeAsyncRedis
+) -> None:
+    """Test clients and configured routes get independent buckets."""
+    app = make_app(
+        monkeypatch,
+        RATE_LIMIT_PER_MINUTE=100,
+        RATE_LIMIT_ROUTES={"/ping": 1},
+        RATE_LIMIT_CLIENT_HEADER="X-API-Key",
+    )
+
+    async with make_client(app) as client:
+        first = await client.get("/ping", headers={"X-API-Key": "a"})
+        second = await client.get("/ping", headers={"X-API-Key": "a"})
+        other = await client.get("/ping", headers={"X-API-Key": "b"})
+        health = [await client.get("/health") for _ in range(3)]
+
+    assert (first.status_code, second.status_code, other.status_code) == (200, 429, 200)
+    assert all(r.status_code == 200 and "ratelimit-limit" not in r.headers for r in health)
+
+
+@pytest.mark.asyncio
+async def test_fails_open_without_redis(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test requests pass through untouched when Redis is not configured."""
+    app = make_app(monkeypatch, RATE_LIMIT_PER_MINUTE=1)
+
+    async with make_client(app) as client:
+        responses = [await client.get("/ping") for _ in range(3)]
+
+    assert all(r.status_code == 200 for r in responses)
+
+
+@pytest.mark.asyncio
+async def test_expired_leases_give_back_unspent_tokens(
+    monkeypatch: pytest.MonkeyPatch, fake_redis: fakeredis.FakeAsyncRedis
+) -> None:
+    """Test spaced requests are only charged for the tokens they spend."""
+    # A zero-length lease expires before the next request, like sparse traffic
+    app = make_app(monkeypatch, RATE_LIMIT_PER_MINUTE=60, RATE_LIMIT_LEASE_SECONDS=0.0)
+
+    async with make_client(app) as client:
+        responses = [await client.get("/ping") for _ in range(30)]
+
+    assert all(r.status_code == 200 for r in responses)
+    assert responses[-1].headers["ratelimit-remaining"] == "30"
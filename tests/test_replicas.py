@@ -0,0 +1,114 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.db import session
+from app.db.base import Base
+from app.main import app
+from app.models.item import Item
+
+
+def make_session_maker(
+    engine: AsyncEngine, class_: type[AsyncSession] = session.ReadSession
+) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, class_=class_, expire_on_commit=False)
+
+
+@pytest.fixture
+async def replica(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> AsyncGenerator[session.Replica]:
+    """A primary and one replica backed by two separate SQLite files."""
+    primary_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    for engine in (primary_engine, replica_engine):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    # Only the replica has this row, so responses show which database served them
+    async with make_session_maker(replica_engine)() as db:
+        db.add(Item(id=1, name="Replica item", owner_id=1))
+        await db.commit()
+
+    replica = session.Replica("replica", replica_engine, make_session_maker(replica_engine))
+    monkeypatch.setattr(
+        session, "async_session_maker", make_session_maker(primary_engine, AsyncSession)
+    )
+    monkeypatch.setattr(session, "primary_read_session_maker", make_session_maker(primary_engine))
+    monkeypatch.setattr(session, "replicas", [replica])
+    yield replica
+
+    await primary_engine.dispose()
+    await replica_engine.dispose()
+
+
+@pytest.fixture
+async def app_client() -> AsyncGenerator[AsyncClient]:
+    """Client using the real session dependencies."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.mark.asyncio
+async def test_reads_use_replica(app_client: AsyncClient, replica: session.Replica) -> None:
+    """Test GET endpoints are served by a healthy replica."""
+    response = await app_client.get("/api/v1/items/1")
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Replica item"
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes(app_client: AsyncClient, replica: session.Replica) -> None:
+    """Test a client's reads go to the primary right after it writes."""
+    created = await app_client.post("/api/v1/items", json={"name": "Primary item"})
+    assert created.status_code == 201
+    assert session.READ_YOUR_WRITES_COOKIE in created.cookies
+
+    response = await app_client.get(f"/api/v1/items/{created.json()['id']}")
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Primary item"
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_replica_falls_back_to_primary(
+    app_client: AsyncClient, replica: session.Replica
+) -> None:
+    """Test reads skip a replica that failed its health check."""
+    replica.healthy = False
+
+    response = await app_client.get("/api/v1/items/1")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_check_replicas(replica: session.Replica, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test replica health follows reachability and the lag threshold."""
+    await session.check_replicas()
+    assert replica.healthy
+
+    async def lagging(_replica: session.Replica) -> float:
+        return 60.0
+
+    monkeypatch.setattr(session, "_replica_lag", lagging)
+    await session.check_replicas()
+    assert not replica.healthy
+    assert replica.lag == 60.0
+
+    async def unreachable(_replica: session.Replica) -> float:
+        raise ConnectionError("replica down")
+
+    replica.healthy = True
+    monkeypatch.setattr(session, "_replica_lag", unreachable)
+    await session.check_replicas()
+    assert not replica.healthy
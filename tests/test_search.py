@@ -0,0 +1,102 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.item import Item
+
+
+async def search(client: AsyncClient, q: str, **params: str | int) -> list[str]:
+    response = await client.get("/api/v1/items/search", params={"q": q, **params})
+    assert response.status_code == 200
+    return [item["name"] for item in response.json()]
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_name_matches_first(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Test every word must match as a prefix and name hits outrank descriptions."""
+    db_session.add_all(
+        [
+            Item(name="Garden hose", description="Green rubber widget", owner_id=1),
+            Item(name="Widget", description="Blue", owner_id=1),
+            Item(name="Gadget", description="Nothing to see", owner_id=1),
+            Item(name="Widgets, blue", description=None, owner_id=1),
+        ]
+    )
+    await db_session.commit()
+
+    assert await search(client, "widget") == ["Widget", "Widgets, blue", "Garden hose"]
+    assert await search(client, "WIDG") == ["Widget", "Widgets, blue", "Garden hose"]
+    assert await search(client, "blue widg") == ["Widgets, blue", "Widget"]
+
+
+@pytest.mark.asyncio
+async def test_search_keyset_pages(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test cursors page through every match exactly once."""
+    db_session.add_all(Item(name=f"Lamp {i}", owner_id=1) for i in range(7))
+    db_session.add(Item(name="Lamp", description="lamp lamp", owner_id=1))
+    await db_session.commit()
+
+    names: list[str] = []
+    params: dict[str, str | int] = {"q": "lamp", "limit": 3}
+    while True:
+        response = await client.get("/api/v1/items/search", params=params)
+        assert response.status_code == 200
+        names += [item["name"] for item in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+
+    assert sorted(names) == sorted(["Lamp", *(f"Lamp {i}" for i in range(7))])
+
+
+@pytest.mark.asyncio
+async def test_search_falls_back_to_similar_names(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Test queries matching no word fall back to names resembling them, with paging."""
+    db_session.add_all(Item(name=f"Toolbox {i}", owner_id=1) for i in range(3))
+    await db_session.commit()
+
+    response = await client.get("/api/v1/items/search", params={"q": "olbo", "limit": 2})
+    assert [item["name"] for item in response.json()] == ["Toolbox 0", "Toolbox 1"]
+
+    cursor = response.headers["X-Next-Cursor"]
+    rest = await search(client, "olbo", limit=2, cursor=cursor)
+    assert rest == ["Toolbox 2"]
+
+
+@pytest.mark.asyncio
+async def test_search_follows_updates_and_deletes(
+    client: AsyncClient, db_session: AsyncSession
+) -> None:
+    """Test the search index tracks item writes."""
+    item = Item(name="Chair", owner_id=1)
+    other = Item(name="Chair cushion", owner_id=1)
+    db_session.add_all([item, other])
+    await db_session.commit()
+
+    item.name = "Stool"
+    await db_session.delete(other)
+    await db_session.commit()
+
+    assert await search(client, "chair") == []
+    assert await search(client, "stool") == ["Stool"]
+
+
+@pytest.mark.asyncio
+async def test_search_rejects_bad_input(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test queries without words and cursors of other listings are rejected."""
+    response = await client.get("/api/v1/items/search", params={"q": "?!"})
+    assert response.status_code == 400
+
+    db_session.add_all(Item(name=f"Item {i}", owner_id=1) for i in range(2))
+    await db_session.commit()
+    listing = await client.get("/api/v1/items", params={"limit": 1})
+    response = await client.get(
+        "/api/v1/items/search",
+        params={"q": "item", "cursor": listing.headers["X-Next-Cursor"]},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,43 @@
+import json
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.serialization import ITEM_ROWS, USER_ROWS
+from app.core.json import dumps
+from app.models.item import Item
+from app.models.user import User
+from app.schemas.item import ItemResponse
+from app.schemas.user import UserResponse
+
+
+@pytest.mark.asyncio
+async def test_rows_match_response_model(db_session: AsyncSession) -> None:
+    """Test row serialization produces what response_model validation would."""
+    db_session.add(Item(name="Row item", description=None, owner_id=7))
+    db_session.add(User(email="row@example.com", username="rowuser", full_name="Row User"))
+    await db_session.commit()
+
+    for model, rows, schema in ((Item, ITEM_ROWS, ItemResponse), (User, USER_ROWS, UserResponse)):
+        obj = (await db_session.scalars(select(model))).one()
+        row = (await db_session.execute(rows.select())).one()
+        expected = json.loads(schema.model_validate(obj).model_dump_json())
+
+        assert json.loads(rows.to_json_list([row])) == [expected]
+        assert rows.to_dict(row) == expected
+
+
+@pytest.mark.parametrize("tz", [UTC, timezone(timedelta(hours=2))])
+def test_datetime_format_matches_pydantic(tz: timezone) -> None:
+    """Test aware timestamps are rendered exactly as pydantic renders them."""
+    stamp = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=tz)
+    row = ("Item", None, 1, 1, stamp, stamp)
+
+    expected = ItemResponse(
+        name="Item", description=None, id=1, owner_id=1, created_at=stamp, updated_at=stamp
+    ).model_dump_json()
+
+    assert ITEM_ROWS.to_json(row) == expected.encode()
+    assert dumps(ITEM_ROWS.to_dict(row)) == expected.encode()
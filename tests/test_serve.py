@@ -0,0 +1,58 @@
+import os
+from typing import Any
+
+import pytest
+
+from app import serve
+from app.core.config import settings
+from app.serve import worker_pool_sizes
+
+
+@pytest.mark.parametrize(
+    ("budget", "workers", "expected"),
+    [
+        (None, 4, (10, 20)),  # no budget: settings apply per worker
+        (120, 4, (10, 20)),  # budget is roomy enough for the configured pools
+        (40, 4, (10, 0)),  # overflow goes first
+        (20, 4, (5, 0)),
+        (2, 4, (1, 0)),  # unmeetable: every worker keeps one; configure_workers warns
+    ],
+)
+def test_worker_pool_sizes(budget: int | None, workers: int, expected: tuple[int, int]) -> None:
+    """Test per-worker pools are shrunk to fit the connection budget."""
+    assert worker_pool_sizes(budget, workers, pool_size=10, max_overflow=20) == expected
+
+
+class RecordingLogger:
+    """Stand-in logger keeping the events it is given."""
+
+    def __init__(self) -> None:
+        self.warnings: list[dict[str, Any]] = []
+
+    def info(self, _event: str, **_kw: Any) -> None:
+        pass
+
+    def warning(self, event: str, **kw: Any) -> None:
+        self.warnings.append({"event": event, **kw})
+
+
+@pytest.mark.parametrize(("budget", "warned"), [(30, False), (2, True)])
+def test_configure_workers_respects_budget(
+    monkeypatch: pytest.MonkeyPatch, budget: int, warned: bool
+) -> None:
+    """Test worker pools fit the default budget and an unmeetable one is reported."""
+    for name in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "REDIS_POOL_SIZE", "REDIS_POOL_WARM_SIZE"):
+        monkeypatch.setenv(name, "")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "/tmp")
+    monkeypatch.setattr(settings, "DB_CONNECTION_BUDGET", budget)
+    monkeypatch.setattr(settings, "REDIS_CONNECTION_BUDGET", None)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 10)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 20)
+    log = RecordingLogger()
+    monkeypatch.setattr(serve, "logger", log)
+
+    serve.configure_workers(4)
+
+    connections = 4 * (int(os.environ["DB_POOL_SIZE"]) + int(os.environ["DB_MAX_OVERFLOW"]))
+    assert (connections > budget) is warned
+    assert [w["setting"] for w in log.warnings] == (["DB_CONNECTION_BUDGET"] if warned else [])
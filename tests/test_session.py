@@ -0,0 +1,89 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Any
+
+import fakeredis
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import QueuePool
+
+from app.db import session
+from app.db.base import Base
+from app.main import app
+from app.models.item import Item
+
+
+@pytest.fixture
+async def engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Item), [{"id": 1, "name": "Item", "owner_id": 1}])
+    yield engine
+    await engine.dispose()
+
+
+def checked_out(engine: AsyncEngine) -> int:
+    pool = engine.pool
+    assert isinstance(pool, QueuePool)
+    return pool.checkedout()
+
+
+@pytest.mark.asyncio
+async def test_read_session_releases_connection_per_query(engine: AsyncEngine) -> None:
+    """Test each query returns its connection to the pool and results stay usable."""
+    async with session.ReadSession(engine, expire_on_commit=False) as db:
+        assert checked_out(engine) == 0
+
+        rows = (await db.execute(select(Item.id, Item.name))).all()
+        assert checked_out(engine) == 0
+        assert not db.in_transaction()
+
+        item = await db.get(Item, 1)
+        name = await db.scalar(select(Item.name).where(Item.id == 1))
+        assert checked_out(engine) == 0
+
+    assert rows == [(1, "Item")]
+    assert item is not None and item.name == name == "Item"
+
+
+@pytest.mark.asyncio
+async def test_read_session_recovers_from_failed_query(engine: AsyncEngine) -> None:
+    """Test a failing query rolls back, releases the connection and leaves the session usable."""
+    async with session.ReadSession(engine) as db:
+        with pytest.raises(OperationalError):
+            await db.execute(text("SELECT * FROM missing"))
+        assert checked_out(engine) == 0
+
+        assert (await db.execute(select(Item.id))).scalars().all() == [1]
+
+
+@pytest.mark.asyncio
+async def test_cached_reads_never_check_out_a_connection(
+    engine: AsyncEngine, fake_redis: fakeredis.FakeAsyncRedis, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a read served from cache does not touch the pool."""
+    monkeypatch.setattr(session, "replicas", [])
+    monkeypatch.setattr(
+        session, "primary_read_session_maker", session._session_maker(engine, session.ReadSession)
+    )
+    checkouts: list[Any] = []
+
+    def record(*args: Any) -> None:
+        checkouts.append(args)
+
+    event.listen(engine.sync_engine.pool, "checkout", record)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            first = await ac.get("/api/v1/items/1")
+            loaded = len(checkouts)
+            second = await ac.get("/api/v1/items/1")
+    finally:
+        event.remove(engine.sync_engine.pool, "checkout", record)
+
+    assert first.json() == second.json()
+    assert loaded == 1
+    assert len(checkouts) == 1
@@ -0,0 +1,63 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.item import Item
+
+
+@contextmanager
+def count_statements(db_session: AsyncSession) -> Iterator[list[str]]:
+    """Record every SQL statement sent to the test database."""
+    engine = db_session.get_bind()
+    statements: list[str] = []
+
+    def record(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.asyncio
+async def test_refresh_after_insert_costs_extra_statement(db_session: AsyncSession) -> None:
+    """Baseline: the old add/commit/refresh pattern issues two statements."""
+    with count_statements(db_session) as statements:
+        item = Item(name="Item", owner_id=1)
+        db_session.add(item)
+        await db_session.commit()
+        await db_session.refresh(item)
+
+    assert [s.split()[0] for s in statements] == ["INSERT", "SELECT"]
+
+
+@pytest.mark.asyncio
+async def test_create_item_single_statement(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test creating an item is a single INSERT ... RETURNING."""
+    with count_statements(db_session) as statements:
+        response = await client.post("/api/v1/items", json={"name": "Item"})
+
+    assert response.status_code == 201
+    assert response.json()["created_at"] is not None
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT") and "RETURNING" in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_create_user_single_statement(client: AsyncClient, db_session: AsyncSession) -> None:
+    """Test creating a user is a single INSERT ... RETURNING."""
+    with count_statements(db_session) as statements:
+        response = await client.post(
+            "/api/v1/users", json={"email": "user@example.com", "username": "user"}
+        )
+
+    assert response.status_code == 201
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT") and "RETURNING" in statements[0]
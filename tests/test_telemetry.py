@@ -0,0 +1,95 @@
+import time
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import Decision
+from opentelemetry.trace import Status, StatusCode
+
+from app.core.telemetry import TailSamplingSpanProcessor, build_sampler
+
+
+def make_tracer(
+    success_ratio: float, latency_threshold_ms: float = 1000.0
+) -> tuple[TracerProvider, InMemorySpanExporter]:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(
+        TailSamplingSpanProcessor(
+            SimpleSpanProcessor(exporter),
+            latency_threshold_ms=latency_threshold_ms,
+            success_ratio=success_ratio,
+        )
+    )
+    return provider, exporter
+
+
+def test_fast_successes_are_dropped() -> None:
+    """Test fast, successful traces are dropped with all their spans."""
+    provider, exporter = make_tracer(success_ratio=0.0)
+    tracer = provider.get_tracer(__name__)
+
+    with tracer.start_as_current_span("GET /items"), tracer.start_as_current_span("db"):
+        pass
+
+    assert exporter.get_finished_spans() == ()
+
+
+def test_errors_are_kept() -> None:
+    """Test a trace is kept whole when any span in it errored."""
+    provider, exporter = make_tracer(success_ratio=0.0)
+    tracer = provider.get_tracer(__name__)
+
+    with tracer.start_as_current_span("GET /items"), tracer.start_as_current_span("db") as child:
+        child.set_status(Status(StatusCode.ERROR))
+
+    assert [span.name for span in exporter.get_finished_spans()] == ["db", "GET /items"]
+
+
+def test_slow_requests_are_kept() -> None:
+    """Test traces whose root exceeds the latency threshold are kept."""
+    provider, exporter = make_tracer(success_ratio=0.0, latency_threshold_ms=1)
+    tracer = provider.get_tracer(__name__)
+
+    with tracer.start_as_current_span("GET /items"):
+        time.sleep(0.002)
+
+    assert len(exporter.get_finished_spans()) == 1
+
+
+def test_pending_traces_are_bounded() -> None:
+    """Test child spans whose root never ends do not accumulate forever."""
+    exporter = InMemorySpanExporter()
+    processor = TailSamplingSpanProcessor(
+        SimpleSpanProcessor(exporter),
+        latency_threshold_ms=1000,
+        success_ratio=1.0,
+        max_pending_traces=2,
+    )
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+    tracer = provider.get_tracer(__name__)
+
+    for _ in range(5):
+        root = tracer.start_span("root")
+        tracer.start_span("child", context=trace.set_span_in_context(root)).end()
+
+    assert len(processor._pending) == 2
+    assert processor.dropped == 3
+
+
+@pytest.mark.parametrize(
+    ("name", "ratio", "expected"),
+    [
+        ("always_on", 0.0, Decision.RECORD_AND_SAMPLE),
+        ("always_off", 1.0, Decision.DROP),
+        ("traceidratio", 0.0, Decision.DROP),
+        ("parentbased_traceidratio", 1.0, Decision.RECORD_AND_SAMPLE),
+    ],
+)
+def test_build_sampler(name: str, ratio: float, expected: Decision) -> None:
+    """Test configured sampler names map to head samplers."""
+    result = build_sampler(name, ratio).should_sample(None, 0x1234, "span")
+    assert result.decision is expected
@@ -1,5 +1,10 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.dml import _insert_each
+from app.models.user import User
 
 
 @pytest.mark.asyncio
@@ -36,3 +41,62 @@ async def test_create_duplicate_user(client: AsyncClient) -> None:
     # Try to create duplicate
     response = await client.post("/api/v1/users", json=user_data)
     assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_create_users_batch(client: AsyncClient) -> None:
+    """Test batch creation reports invalid and duplicate rows per index."""
+    response = await client.post(
+        "/api/v1/users",
+        json={"email": "taken@example.com", "username": "taken"},
+    )
+    assert response.status_code == 201
+
+    response = await client.post(
+        "/api/v1/users:batch",
+        json=[
+            {"email": "a@example.com", "username": "alpha"},
+            {"email": "taken@example.com", "username": "other"},
+            {"email": "not-an-email", "username": "bravo"},
+            {"email": "b@example.com", "username": "alpha"},
+            {"email": "c@example.com", "username": "charlie"},
+        ],
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert [user["username"] for user in data["created"]] == ["alpha", "charlie"]
+    assert [(error["index"], error["errors"][0]["type"]) for error in data["errors"]] == [
+        (1, "unique"),
+        (2, "value_error"),
+        (3, "unique"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_user_conditional(client: AsyncClient) -> None:
+    """Test If-None-Match with the current ETag returns 304."""
+    created = await client.post(
+        "/api/v1/users", json={"email": "etag@example.com", "username": "etag"}
+    )
+    url = f"/api/v1/users/{created.json()['id']}"
+    etag = (await client.get(url)).headers["ETag"]
+
+    response = await client.get(url, headers={"If-None-Match": f'"other", {etag}'})
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_insert_each_skips_conflicts(db_session: AsyncSession) -> None:
+    """Test the savepoint fallback for dialects without ON CONFLICT skips duplicates."""
+    rows = [
+        {"email": "a@example.com", "username": "alpha"},
+        {"email": "b@example.com", "username": "alpha"},
+        {"email": "c@example.com", "username": "charlie"},
+    ]
+
+    inserted = await _insert_each(db_session, User, rows)
+    await db_session.commit()
+
+    assert [user.email for user in inserted] == ["a@example.com", "c@example.com"]
+    assert all(user.id is not None and user.created_at is not None for user in inserted)
+    assert await db_session.scalar(select(func.count()).select_from(User)) == 2